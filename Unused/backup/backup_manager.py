@@ -4,22 +4,52 @@ Backup Manager for MyRVM Platform Integration
 Central backup management system with automated scheduling and monitoring
 """
 
+import io
 import os
 import json
 import logging
+import mmap
 import threading
 import time
 import shutil
 import gzip
 import tarfile
+import subprocess
 from datetime import datetime, timedelta
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import schedule
 from cryptography.fernet import Fernet
 from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
 
+# Microseconds keep back-to-back backups of the same strategy from colliding
+BACKUP_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S_%f'
+
+# 1 MiB copy chunks cut read/write syscalls (tarfile defaults to 16 KiB, shutil to 64 KiB)
+COPY_BUFSIZE = 1 << 20
+
+# Files that gain nothing from another gzip pass
+COMPRESSED_EXTENSIONS = ('.gz', '.zst', '.xz', '.bz2', '.zip')
+
+class _CountingWriter:
+    """Write-only stream wrapper that counts the bytes passing through it"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_written = 0
+    
+    def write(self, data) -> int:
+        self.bytes_written += len(data)
+        return self.stream.write(data)
+    
+    def tell(self) -> int:
+        return self.bytes_written
+
 class BackupManager:
     """Central backup management system"""
     
@@ -36,6 +66,9 @@ class BackupManager:
         self.retention_days = config.get('retention_days', 30)
         self.compression_enabled = config.get('compression_enabled', True)
         self.encryption_enabled = config.get('encryption_enabled', True)
+        self.compression_tool = config.get('compression_tool', 'gzip')  # 'gzip' or 'pigz'
+        self.compression_level = config.get('compression_level', 9)
+        self.skip_compressed_extensions = config.get('skip_compressed_extensions', False)
         
         # Backup directories
         backup_dir_name = config.get('backup_dir', 'backups')
@@ -67,15 +100,21 @@ class BackupManager:
         # Setup logging
         self.logger = self._setup_logger()
         
+        # Parallel gzip keeps the .gz format RecoveryManager restores from
+        self._pigz_path = shutil.which('pigz') if self.compression_tool == 'pigz' else None
+        if self.compression_tool == 'pigz' and not self._pigz_path:
+            self.logger.warning("pigz not found, falling back to gzip compression")
+        
         # Backup callbacks
         self.backup_callbacks = []
         
         # Initialize encryption
         self.encryption_key = self._get_or_create_encryption_key()
+        self.cipher_suite = Fernet(self.encryption_key) if self.encryption_key else None
         
         # Backup history
-        self.backup_history = []
         self.max_history_size = 1000
+        self.backup_history = deque(maxlen=self.max_history_size)
         
         # Initialize backup strategies
         self._initialize_backup_strategies()
@@ -246,32 +285,57 @@ class BackupManager:
         """Run backup for specific strategy"""
         try:
             with self.backup_lock:
-                self.logger.info(f"Starting {strategy_name} backup")
-                
-                start_time = time.time()
-                backup_result = self._execute_backup(strategy_name)
-                end_time = time.time()
-                
-                backup_result['duration'] = end_time - start_time
-                backup_result['timestamp'] = now().isoformat()
-                backup_result['strategy'] = strategy_name
-                
-                # Store backup result
-                self.backup_history.append(backup_result)
-                if len(self.backup_history) > self.max_history_size:
-                    self.backup_history.pop(0)
-                
-                # Notify callbacks
-                self._notify_backup_callbacks(backup_result)
+                self._record_backup(strategy_name)
                 
                 # Cleanup old backups
                 self._cleanup_old_backups(strategy_name)
                 
-                self.logger.info(f"Completed {strategy_name} backup in {backup_result['duration']:.2f}s")
-                
         except Exception as e:
             self.logger.error(f"Error running {strategy_name} backup: {e}")
     
+    def _record_backup(self, strategy_name: str) -> Dict:
+        """Execute a backup and record its result (caller holds backup_lock)"""
+        self.logger.info(f"Starting {strategy_name} backup")
+        
+        start_time = time.perf_counter()
+        backup_result = self._execute_backup(strategy_name)
+        if backup_result.get('success'):
+            backup_result['verified'], backup_result['checksum'] = self._verify_backup(Path(backup_result['backup_file']))
+        end_time = time.perf_counter()
+        
+        backup_result['duration'] = end_time - start_time
+        backup_result['timestamp'] = now().isoformat()
+        backup_result['strategy'] = strategy_name
+        
+        # Store backup result
+        self.backup_history.append(backup_result)
+        
+        # Notify callbacks
+        self._notify_backup_callbacks(backup_result)
+        
+        self.logger.info(f"Completed {strategy_name} backup in {backup_result['duration']:.2f}s")
+        return backup_result
+    
+    def _verify_backup(self, path: Path) -> Tuple[bool, Optional[str]]:
+        """
+        Flush a finished backup to disk and confirm it is non-empty
+        
+        Returns:
+            Whether the file verified, and its SHA-256 (hashed in one call over
+            a read-only memory map)
+        """
+        try:
+            with open(path, 'rb') as f:
+                os.fsync(f.fileno())
+                # Empty files cannot be mapped and never verify
+                if os.fstat(f.fileno()).st_size == 0:
+                    return False, hashlib.sha256().hexdigest()
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return True, hashlib.sha256(mapped).hexdigest()
+        except OSError as e:
+            self.logger.error(f"Error verifying backup {path}: {e}")
+            return False, None
+    
     def _execute_backup(self, strategy_name: str) -> Dict:
         """Execute backup for specific strategy"""
         try:
@@ -303,20 +367,21 @@ class BackupManager:
             # In a real implementation, you would connect to your database
             # and create a backup dump
             
-            backup_file = self.database_backup_dir / f"database_backup_{now().strftime('%Y%m%d_%H%M%S')}.sql"
+            backup_file = self.database_backup_dir / f"database_backup_{now().strftime(BACKUP_TIMESTAMP_FORMAT)}.sql"
             
             # Create a dummy database backup file for demonstration
             with open(backup_file, 'w') as f:
                 f.write(f"-- Database backup created at {now().isoformat()}\n")
                 f.write("-- This is a placeholder for actual database backup\n")
+            original_size = backup_file.stat().st_size
             
-            # Apply compression and encryption
+            # Apply compression and encryption (removes the plain dump)
             processed_file = self._process_backup_file(backup_file, strategy_config)
             
             return {
                 'success': True,
                 'backup_file': str(processed_file),
-                'original_size': backup_file.stat().st_size,
+                'original_size': original_size,
                 'compressed_size': processed_file.stat().st_size if processed_file.exists() else 0,
                 'strategy': 'database'
             }
@@ -332,20 +397,19 @@ class BackupManager:
         """Backup configuration files"""
         try:
             config_dir = Path(__file__).parent.parent / 'config'
-            backup_file = self.config_backup_dir / f"config_backup_{now().strftime('%Y%m%d_%H%M%S')}.tar"
+            backup_file = self.config_backup_dir / f"config_backup_{now().strftime(BACKUP_TIMESTAMP_FORMAT)}.tar"
             
-            # Create tar archive of config directory
-            with tarfile.open(backup_file, 'w') as tar:
+            def add_members(tar):
                 if config_dir.exists():
                     tar.add(config_dir, arcname='config')
             
-            # Apply compression and encryption
-            processed_file = self._process_backup_file(backup_file, strategy_config)
+            # Stream the tar archive of config directory through compression and encryption
+            processed_file, original_size = self._write_archive(backup_file, strategy_config, add_members)
             
             return {
                 'success': True,
                 'backup_file': str(processed_file),
-                'original_size': backup_file.stat().st_size,
+                'original_size': original_size,
                 'compressed_size': processed_file.stat().st_size if processed_file.exists() else 0,
                 'strategy': 'config'
             }
@@ -361,20 +425,23 @@ class BackupManager:
         """Backup log files"""
         try:
             logs_dir = Path(__file__).parent.parent / 'logs'
-            backup_file = self.log_backup_dir / f"logs_backup_{now().strftime('%Y%m%d_%H%M%S')}.tar"
+            backup_file = self.log_backup_dir / f"logs_backup_{now().strftime(BACKUP_TIMESTAMP_FORMAT)}.tar"
+            
+            # Skip the gzip pass when most of the logs are rotated, already-compressed files
+            if self.skip_compressed_extensions and self._is_mostly_compressed(logs_dir):
+                strategy_config = {**strategy_config, 'compression': False}
             
-            # Create tar archive of logs directory
-            with tarfile.open(backup_file, 'w') as tar:
+            def add_members(tar):
                 if logs_dir.exists():
                     tar.add(logs_dir, arcname='logs')
             
-            # Apply compression and encryption
-            processed_file = self._process_backup_file(backup_file, strategy_config)
+            # Stream the tar archive of logs directory through compression and encryption
+            processed_file, original_size = self._write_archive(backup_file, strategy_config, add_members)
             
             return {
                 'success': True,
                 'backup_file': str(processed_file),
-                'original_size': backup_file.stat().st_size,
+                'original_size': original_size,
                 'compressed_size': processed_file.stat().st_size if processed_file.exists() else 0,
                 'strategy': 'logs'
             }
@@ -390,21 +457,32 @@ class BackupManager:
         """Backup application files"""
         try:
             app_dir = Path(__file__).parent.parent
-            backup_file = self.app_backup_dir / f"app_backup_{now().strftime('%Y%m%d_%H%M%S')}.tar"
+            backup_file = self.app_backup_dir / f"app_backup_{now().strftime(BACKUP_TIMESTAMP_FORMAT)}.tar"
+            
+            # A relative backup_dir lives inside the application tree; never archive
+            # it, since sibling strategies may be writing there concurrently
+            try:
+                backup_arcname = self.backup_dir.resolve().relative_to(app_dir.resolve()).as_posix()
+            except ValueError:
+                backup_arcname = None
+            
+            def skip_backup_dir(tarinfo):
+                if backup_arcname and (tarinfo.name == backup_arcname or tarinfo.name.startswith(backup_arcname + '/')):
+                    return None
+                return tarinfo
             
-            # Create tar archive of application directory (excluding backups and logs)
-            with tarfile.open(backup_file, 'w') as tar:
+            def add_members(tar):
                 for item in app_dir.iterdir():
                     if item.name not in ['backups', 'logs', '__pycache__', '.git']:
-                        tar.add(item, arcname=item.name)
+                        tar.add(item, arcname=item.name, filter=skip_backup_dir)
             
-            # Apply compression and encryption
-            processed_file = self._process_backup_file(backup_file, strategy_config)
+            # Stream the tar archive of application directory (excluding backups and logs)
+            processed_file, original_size = self._write_archive(backup_file, strategy_config, add_members)
             
             return {
                 'success': True,
                 'backup_file': str(processed_file),
-                'original_size': backup_file.stat().st_size,
+                'original_size': original_size,
                 'compressed_size': processed_file.stat().st_size if processed_file.exists() else 0,
                 'strategy': 'application'
             }
@@ -424,9 +502,7 @@ class BackupManager:
             # Apply compression
             if strategy_config.get('compression', True):
                 compressed_file = backup_file.with_suffix(backup_file.suffix + '.gz')
-                with open(backup_file, 'rb') as f_in:
-                    with gzip.open(compressed_file, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
+                self._compress_file(backup_file, compressed_file)
                 
                 # Remove original file
                 backup_file.unlink()
@@ -439,8 +515,7 @@ class BackupManager:
                 with open(processed_file, 'rb') as f_in:
                     data = f_in.read()
                 
-                cipher_suite = Fernet(self.encryption_key)
-                encrypted_data = cipher_suite.encrypt(data)
+                encrypted_data = self.cipher_suite.encrypt(data)
                 
                 with open(encrypted_file, 'wb') as f_out:
                     f_out.write(encrypted_data)
@@ -455,6 +530,98 @@ class BackupManager:
             self.logger.error(f"Error processing backup file: {e}")
             return backup_file
     
+    def _write_archive(self, backup_file: Path, strategy_config: Dict,
+                       add_members: Callable[[tarfile.TarFile], None]) -> Tuple[Path, int]:
+        """
+        Write a tar archive straight through compression and encryption
+        
+        Nothing intermediate touches the disk: tar feeds gzip (or pigz) and the
+        result goes to the final file, or to memory first when encrypting,
+        since Fernet encrypts whole messages.
+        
+        Returns:
+            The final backup file and the uncompressed archive size
+        """
+        compress = strategy_config.get('compression', True)
+        encrypt = strategy_config.get('encryption', True) and self.encryption_key
+        
+        processed_file = backup_file
+        if compress:
+            processed_file = processed_file.with_suffix(processed_file.suffix + '.gz')
+        if encrypt:
+            processed_file = processed_file.with_suffix(processed_file.suffix + '.enc')
+        
+        sink = io.BytesIO() if encrypt else open(processed_file, 'wb')
+        try:
+            with self._compressed_stream(sink, compress) as stream:
+                archive = _CountingWriter(stream)
+                with tarfile.open(fileobj=archive, mode='w', copybufsize=COPY_BUFSIZE) as tar:
+                    add_members(tar)
+            
+            if encrypt:
+                with open(processed_file, 'wb') as f_out:
+                    f_out.write(self.cipher_suite.encrypt(sink.getvalue()))
+        finally:
+            sink.close()
+        
+        return processed_file, archive.bytes_written
+    
+    @contextmanager
+    def _compressed_stream(self, sink, compress: bool):
+        """Yield a writable stream that gzip-compresses into sink"""
+        if not compress:
+            yield sink
+        elif self._pigz_path:
+            process = subprocess.Popen(
+                [self._pigz_path, '-p', str(os.cpu_count() or 1), f'-{self.compression_level}', '-c'],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+            # Drain pigz concurrently so neither side of the pipe blocks
+            reader = threading.Thread(target=shutil.copyfileobj, args=(process.stdout, sink))
+            reader.start()
+            try:
+                yield process.stdin
+            finally:
+                process.stdin.close()
+                reader.join()
+                process.stdout.close()
+                returncode = process.wait()
+            if returncode:
+                raise subprocess.CalledProcessError(returncode, self._pigz_path)
+        else:
+            with gzip.GzipFile(fileobj=sink, mode='wb', compresslevel=self.compression_level) as stream:
+                yield stream
+    
+    def _is_mostly_compressed(self, directory: Path) -> bool:
+        """Check whether at least half the bytes under directory are already-compressed files"""
+        total = compressed = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                try:
+                    size = os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    continue
+                total += size
+                if name.endswith(COMPRESSED_EXTENSIONS):
+                    compressed += size
+        return total > 0 and compressed * 2 >= total
+    
+    def _compress_file(self, source: Path, target: Path):
+        """Gzip-compress a file, across all cores when pigz is configured"""
+        if self._pigz_path:
+            with open(target, 'wb') as f_out:
+                subprocess.run(
+                    [self._pigz_path, '-p', str(os.cpu_count() or 1), f'-{self.compression_level}', '-c', str(source)],
+                    stdout=f_out, check=True
+                )
+        else:
+            with open(source, 'rb') as f_in:
+                # Ask the kernel for aggressive readahead on the one-pass read
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f_in.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                with gzip.open(target, 'wb', compresslevel=self.compression_level) as f_out:
+                    shutil.copyfileobj(f_in, f_out, COPY_BUFSIZE)
+    
     def _cleanup_old_backups(self, strategy_name: str):
         """Cleanup old backups based on retention policy"""
         try:
@@ -523,7 +690,7 @@ class BackupManager:
             
             # Get latest backup result
             latest_backup = None
-            for backup in reversed(self.backup_history):
+            for backup in self.iter_backup_history():
                 if backup.get('strategy') == strategy_name:
                     latest_backup = backup
                     break
@@ -534,6 +701,45 @@ class BackupManager:
             self.logger.error(f"Error running manual backup: {e}")
             return {'success': False, 'error': str(e)}
     
+    def run_manual_backups(self, strategy_names: List[str], concurrent: bool = False) -> List[Dict]:
+        """
+        Run several manual backups in one batch
+        
+        The backup lock is taken once and old backups are cleaned up once per
+        strategy after the batch, instead of after every backup.
+        
+        Args:
+            strategy_names: Strategies to back up, in order (repeats allowed)
+            concurrent: Overlap the backups on a thread pool; tar/gzip/encryption
+                release the GIL and each strategy writes to its own directory
+        
+        Returns:
+            One result per requested strategy, in the same order
+        """
+        try:
+            unknown = set(strategy_names) - set(self.backup_strategies)
+            if unknown:
+                raise ValueError(f"Unknown backup strategy: {', '.join(sorted(unknown))}")
+            
+            unique_names = list(dict.fromkeys(strategy_names))
+            mode = "concurrent" if concurrent else "sequential"
+            self.logger.info(f"Running {len(strategy_names)} manual backups ({mode}): {', '.join(strategy_names)}")
+            with self.backup_lock:
+                if concurrent and len(strategy_names) > 1:
+                    with ThreadPoolExecutor(max_workers=len(unique_names)) as executor:
+                        results = list(executor.map(self._record_backup, strategy_names))
+                else:
+                    results = [self._record_backup(strategy_name) for strategy_name in strategy_names]
+                
+                for strategy_name in unique_names:
+                    self._cleanup_old_backups(strategy_name)
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error running manual backups: {e}")
+            return [{'success': False, 'error': str(e)} for _ in strategy_names]
+    
     def get_backup_status(self) -> Dict:
         """Get backup system status"""
         try:
@@ -555,10 +761,18 @@ class BackupManager:
             self.logger.error(f"Error getting backup status: {e}")
             return {}
     
+    def iter_backup_history(self):
+        """Iterate backup history newest-first"""
+        return reversed(self.backup_history)
+    
     def get_backup_history(self, limit: int = 100) -> List[Dict]:
-        """Get backup history"""
+        """Get backup history, oldest-first, reading only the last `limit` entries"""
         try:
-            return self.backup_history[-limit:] if limit else self.backup_history
+            if not limit:
+                return list(self.backup_history)
+            recent = list(islice(self.iter_backup_history(), limit))
+            recent.reverse()
+            return recent
         except Exception as e:
             self.logger.error(f"Error getting backup history: {e}")
             return []
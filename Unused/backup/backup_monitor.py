@@ -11,7 +11,9 @@ import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
 import psutil
 from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
 
@@ -169,9 +171,7 @@ class BackupMonitor:
                 
                 # Collect monitoring data
                 with self.monitoring_lock:
-                    self._collect_backup_status()
-                    self._collect_storage_usage()
-                    self._collect_performance_metrics()
+                    self._collect_all()
                     self._check_monitoring_rules()
                 
                 # Calculate sleep time
@@ -187,6 +187,23 @@ class BackupMonitor:
                 self.logger.error(f"Error in backup monitoring loop: {e}")
                 time.sleep(60)  # Wait before retrying
     
+    def collect_all(self):
+        """Collect backup status, storage usage and performance metrics"""
+        with self.monitoring_lock:
+            self._collect_all()
+    
+    def _collect_all(self):
+        """Run the collectors concurrently (caller holds monitoring_lock)"""
+        # Each collector writes its own monitoring_data key and handles its own errors
+        collectors = [
+            self._collect_backup_status,
+            self._collect_storage_usage,
+            self._collect_performance_metrics
+        ]
+        with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+            for future in [executor.submit(collector) for collector in collectors]:
+                future.result()
+    
     def _collect_backup_status(self):
         """Collect backup status information"""
         try:
@@ -475,6 +492,10 @@ class BackupMonitor:
         with self.monitoring_lock:
             return self.monitoring_data.copy()
     
+    def monitoring_view(self) -> Mapping:
+        """Get a read-only live view of the monitoring data (unlocked, not JSON-serializable)"""
+        return MappingProxyType(self.monitoring_data)
+    
     def get_monitoring_status(self) -> Dict:
         """Get backup monitoring status"""
         try:
@@ -12,6 +12,8 @@ import gzip
 import tarfile
 import time
 from datetime import datetime, timedelta
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Callable
 from cryptography.fernet import Fernet
@@ -47,8 +49,8 @@ class RecoveryManager:
         self.recovery_callbacks = []
         
         # Recovery history
-        self.recovery_history = []
         self.max_history_size = 1000
+        self.recovery_history = deque(maxlen=self.max_history_size)
         
         # Recovery procedures
         self._initialize_recovery_procedures()
@@ -188,8 +190,6 @@ class RecoveryManager:
             
             # Store recovery result
             self.recovery_history.append(result)
-            if len(self.recovery_history) > self.max_history_size:
-                self.recovery_history.pop(0)
             
             # Notify callbacks
             self._notify_recovery_callbacks(result)
@@ -594,10 +594,18 @@ from utils.timezone_manager import get_timezone_manager, now, format_datetime, u
             self.logger.error(f"Error getting recovery status: {e}")
             return {}
     
+    def iter_recovery_history(self):
+        """Iterate recovery history newest-first"""
+        return reversed(self.recovery_history)
+    
     def get_recovery_history(self, limit: int = 100) -> List[Dict]:
-        """Get recovery history"""
+        """Get recovery history, oldest-first, reading only the last `limit` entries"""
         try:
-            return self.recovery_history[-limit:] if limit else self.recovery_history
+            if not limit:
+                return list(self.recovery_history)
+            recent = list(islice(self.iter_recovery_history(), limit))
+            recent.reverse()
+            return recent
         except Exception as e:
             self.logger.error(f"Error getting recovery history: {e}")
             return []
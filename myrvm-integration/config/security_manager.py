@@ -89,6 +89,11 @@ class SecurityManager:
         
         return logger
     
+    @staticmethod
+    def _fp(token: str) -> str:
+        """Fingerprint token for logs without exposing any part of it"""
+        return hashlib.blake2b(token.encode(), digest_size=6).hexdigest()
+    
     def _get_or_create_encryption_key(self) -> bytes:
         """Get or create encryption key"""
         key_file = self.keys_dir / 'encryption.key'
@@ -275,10 +280,12 @@ from utils.timezone_manager import get_timezone_manager, now, format_datetime, u
         try:
             token = secrets.token_urlsafe(32)
             expiry_time = now() + timedelta(hours=expiry_hours)
+            fingerprint = self._fp(token)
             
             self.access_tokens[token] = {
                 'user_id': user_id,
                 'permissions': permissions or [],
+                'fingerprint': fingerprint,
                 'created_at': now().isoformat(),
                 'expires_at': expiry_time.isoformat()
             }
@@ -287,6 +294,7 @@ from utils.timezone_manager import get_timezone_manager, now, format_datetime, u
             
             self._log_security_event('access_token_generated', {
                 'user_id': user_id,
+                'token': fingerprint,
                 'permissions': permissions or [],
                 'expiry_hours': expiry_hours
             })
@@ -303,17 +311,17 @@ from utils.timezone_manager import get_timezone_manager, now, format_datetime, u
         try:
             if token not in self.access_tokens:
                 self._log_security_event('access_token_invalid', {
-                    'token': token[:8] + '...' if len(token) > 8 else token
+                    'token': self._fp(token)
                 })
                 return None
             
             # Check expiry
             if now() > self.token_expiry[token]:
-                del self.access_tokens[token]
+                fingerprint = self.access_tokens.pop(token)['fingerprint']
                 del self.token_expiry[token]
                 
                 self._log_security_event('access_token_expired', {
-                    'token': token[:8] + '...' if len(token) > 8 else token
+                    'token': fingerprint
                 })
                 return None
             
@@ -334,18 +342,18 @@ from utils.timezone_manager import get_timezone_manager, now, format_datetime, u
         """Revoke access token"""
         try:
             if token in self.access_tokens:
-                user_id = self.access_tokens[token]['user_id']
-                del self.access_tokens[token]
+                token_data = self.access_tokens.pop(token)
+                user_id = token_data['user_id']
                 del self.token_expiry[token]
                 
                 self._log_security_event('access_token_revoked', {
                     'user_id': user_id,
-                    'token': token[:8] + '...' if len(token) > 8 else token
+                    'token': token_data['fingerprint']
                 })
                 
                 self.logger.info(f"Access token revoked for user: {user_id}")
             else:
-                self.logger.warning(f"Access token not found for revocation: {token[:8]}...")
+                self.logger.warning(f"Access token not found for revocation: {self._fp(token)}")
                 
         except Exception as e:
             self.logger.error(f"Failed to revoke access token: {e}")
@@ -7,17 +7,172 @@ Production-ready service management and systemd integration
 import os
 import sys
 import json
+import queue
+import atexit
 import logging
+import logging.handlers
+import hashlib
+import string
+import functools
 import subprocess
+import threading
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-import psutil
+from typing import Dict, Any, Optional, List, Tuple
+from utils.timezone_manager import now
+
+try:
+    from pystemd.systemd1 import Manager as SystemdManager
+    PYSTEMD_AVAILABLE = True
+except ImportError:
+    PYSTEMD_AVAILABLE = False
+
+# Integration directory layout
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+LOG_DIR = SERVICE_DIR / 'logs'
+MAIN_DIR = SERVICE_DIR / 'main'
+MAIN_SCRIPT = MAIN_DIR / 'enhanced_jetson_main.py'
+MAIN_CONFIG_FILE = MAIN_DIR / 'config.json'
+HEALTH_CHECK_SCRIPT = SERVICE_DIR / 'scripts' / 'health_check.py'
+
+# Unit properties fetched by get_service_status()
+SYSTEMD_STATUS_PROPERTIES = ('ActiveState', 'SubState', 'LoadState', 'MainPID', 'UnitFileState')
+
+# Seconds an is-active result is reused by is_service_running()
+ACTIVE_CACHE_TTL = 0.2
+
+# Trailer line printed by journalctl --show-cursor
+JOURNAL_CURSOR_PREFIX = '-- cursor: '
+
+# Log records are queued here and written by a background listener
+_log_queue = queue.Queue(-1)
+
+# Seconds between flushes of the buffered service log
+LOG_FLUSH_INTERVAL = 5
+
+# systemd unit file, filled from ServiceManager.service_config
+SYSTEMD_UNIT_TEMPLATE = string.Template("""[Unit]
+Description=MyRVM Platform Integration Service
+Documentation=https://github.com/vnot01/test-cv-yolo11-sam2-camera
+After=network.target network-online.target
+Wants=network-online.target
+StartLimitInterval=60
+StartLimitBurst=3
+
+[Service]
+Type=simple
+User=${service_user}
+Group=${service_group}
+WorkingDirectory=${working_directory}
+ExecStart=${python_executable} ${main_script} --config ${config_file}
+ExecReload=/bin/kill -HUP $$MAINPID
+ExecStop=/bin/kill -TERM $$MAINPID
+PIDFile=${pid_file}
+Restart=${restart_policy}
+RestartSec=${restart_sec}
+TimeoutStartSec=${timeout_start_sec}
+TimeoutStopSec=${timeout_stop_sec}
+StandardOutput=append:${log_file}
+StandardError=append:${log_file}
+Environment=PYTHONPATH=${working_directory}
+Environment=MYRVM_ENVIRONMENT=production
+
+# Security settings
+NoNewPrivileges=true
+PrivateTmp=true
+ProtectSystem=strict
+ProtectHome=true
+ReadWritePaths=${working_directory} /tmp /var/run
+
+# Resource limits
+LimitNOFILE=65536
+LimitNPROC=4096
+
+[Install]
+WantedBy=multi-user.target
+""")
+
+@functools.lru_cache(maxsize=1)
+def _render_systemd_unit(config_items: tuple) -> str:
+    """Render the systemd unit for a frozen service config"""
+    return SYSTEMD_UNIT_TEMPLATE.substitute(dict(config_items))
+
+# Script written by ServiceManager.create_health_check_endpoint()
+HEALTH_CHECK_SOURCE = '''#!/usr/bin/env python3
+"""
+Health Check Endpoint for MyRVM Platform Integration
+"""
+
+import sys
+import json
+from pathlib import Path
+
+# Add parent directories to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "main"))
+
+def health_check():
+    """Perform health check"""
+    try:
+        # Import main service
+        from enhanced_jetson_main import EnhancedJetsonMain
+from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
+        
+        # Check if service is running
+        # This is a simplified check - in production, you'd want more comprehensive checks
+        
+        return {
+            'status': 'healthy',
+            'timestamp': now().isoformat(),
+            'service': 'myrvm-integration'
+        }
+        
+    except Exception as e:
+        return {
+            'status': 'unhealthy',
+            'error': str(e),
+            'timestamp': now().isoformat(),
+            'service': 'myrvm-integration'
+        }
+
+if __name__ == "__main__":
+    result = health_check()
+    print(json.dumps(result))
+    sys.exit(0 if result['status'] == 'healthy' else 1)
+'''
+
+class BufferedFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Rotating file handler writing through a large buffer instead of flushing every record"""
+    
+    buffer_size = 65536
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding or 'utf-8')
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
 
 class ServiceManager:
     """Production-ready service management system"""
     
+    # Background listener shared by all instances
+    _log_listener = None
+    
+    # systemctl is-active results shared by all instances: service name -> (monotonic time, active)
+    _active_cache: Dict[str, Tuple[float, bool]] = {}
+    
     def __init__(self, config: Dict):
         """
         Initialize service manager
@@ -31,7 +186,7 @@ class ServiceManager:
         self.service_group = os.getenv('USER', 'jetson')
         
         # Service directories
-        self.service_dir = Path(__file__).parent.parent
+        self.service_dir = SERVICE_DIR
         self.systemd_dir = Path('/etc/systemd/system')
         self.service_file = self.systemd_dir / f'{self.service_name}.service'
         
@@ -41,20 +196,50 @@ class ServiceManager:
         # Service configuration
         self.service_config = self._get_service_config()
         
+        # systemd D-Bus connection (falls back to systemctl when unavailable)
+        self._systemd = self._connect_systemd()
+        
+        # Short-lived status cache for rapid polling
+        self.status_ttl = self.config.get('status_cache_ttl_sec', 0.5)
+        self._status_cache = (0, None)
+        self._service_changed = False
+        
+        # Journal tail kept between get_service_logs() polls
+        self._journal_cursor = None
+        self._journal_tail = deque()
+        
+        # psutil.Process of the service, kept so cpu_percent measures since the previous status check
+        self._process = None
+        
         self.logger.info("Service manager initialized")
     
     def _setup_logger(self) -> logging.Logger:
         """Setup logger for service manager"""
         logger = logging.getLogger('ServiceManager')
+        
+        # Already configured by an earlier instance
+        if logger.handlers:
+            return logger
+        
         logger.setLevel(logging.INFO)
         
+        # Write records from a background thread so callers never block on disk
+        if ServiceManager._log_listener is None:
+            ServiceManager._log_listener = self._start_log_listener()
+        
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        
+        return logger
+    
+    @staticmethod
+    def _start_log_listener() -> logging.handlers.QueueListener:
+        """Start the listener that owns the file and console handlers"""
         # Create logs directory if not exists
-        log_dir = Path(__file__).parent.parent / 'logs'
-        log_dir.mkdir(exist_ok=True)
+        LOG_DIR.mkdir(exist_ok=True)
         
-        # File handler
-        log_file = log_dir / f'service_manager_{now().strftime("%Y%m%d")}.log'
-        file_handler = logging.FileHandler(log_file)
+        # File handler, rotated at midnight
+        log_file = LOG_DIR / 'service_manager.log'
+        file_handler = BufferedFileHandler(log_file, when='midnight', backupCount=14, encoding='utf-8')
         file_handler.setLevel(logging.INFO)
         
         # Console handler
@@ -68,10 +253,83 @@ class ServiceManager:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # Batch file writes; errors are flushed immediately
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=256, flushLevel=logging.ERROR, target=file_handler
+        )
+        
+        listener = logging.handlers.QueueListener(
+            _log_queue, memory_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        stop_flush = ServiceManager._start_log_flusher(memory_handler, file_handler)
+        
+        # Handlers run in reverse order: stop the flusher and the listener, then flush the buffer
+        atexit.register(memory_handler.close)
+        atexit.register(listener.stop)
+        atexit.register(stop_flush.set)
         
-        return logger
+        return listener
+    
+    @staticmethod
+    def _start_log_flusher(memory_handler: logging.Handler, file_handler: logging.Handler,
+                           interval: float = LOG_FLUSH_INTERVAL) -> threading.Event:
+        """Flush buffered log records to disk periodically; set the returned event to stop"""
+        stop = threading.Event()
+        
+        def flush_loop():
+            while not stop.wait(interval):
+                memory_handler.flush()
+                file_handler.flush()
+        
+        threading.Thread(target=flush_loop, name='ServiceManagerLogFlush', daemon=True).start()
+        return stop
+    
+    def _connect_systemd(self):
+        """Connect to the systemd manager over D-Bus"""
+        if not PYSTEMD_AVAILABLE:
+            return None
+        
+        try:
+            manager = SystemdManager()
+            manager.load()
+            return manager
+        except Exception as e:
+            self.logger.warning(f"systemd D-Bus unavailable, using systemctl: {e}")
+            return None
+    
+    def _systemctl(self, action: str) -> Tuple[bool, str]:
+        """Run a systemd manager action for this service"""
+        if self._systemd is not None:
+            unit = f'{self.service_name}.service'.encode()
+            manager = self._systemd.Manager
+            dbus_actions = {
+                'daemon-reload': lambda: manager.Reload(),
+                'enable': lambda: manager.EnableUnitFiles([unit], False, True),
+                'disable': lambda: manager.DisableUnitFiles([unit], False),
+                'start': lambda: manager.StartUnit(unit, b'replace'),
+                'stop': lambda: manager.StopUnit(unit, b'replace'),
+                'restart': lambda: manager.RestartUnit(unit, b'replace'),
+                'reload': lambda: manager.ReloadUnit(unit, b'replace'),
+            }
+            try:
+                dbus_actions[action]()
+                return True, ''
+            except Exception as e:
+                self.logger.warning(f"systemd D-Bus {action} failed, using systemctl: {e}")
+        
+        args = [action] if action == 'daemon-reload' else [action, self.service_name]
+        result = self._run_systemctl(*args)
+        if result.returncode != 0:
+            return False, result.stderr.decode('utf-8', 'replace')
+        return True, ''
+    
+    @staticmethod
+    def _run_systemctl(*args: str) -> subprocess.CompletedProcess:
+        """Run sudo systemctl keeping only stderr (raw bytes) for error reporting"""
+        return subprocess.run(['sudo', 'systemctl', *args],
+                              stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, close_fds=True)
     
     def _get_service_config(self) -> Dict:
         """Get service configuration"""
@@ -81,9 +339,9 @@ class ServiceManager:
             'service_group': self.service_group,
             'working_directory': str(self.service_dir),
             'python_executable': sys.executable,
-            'main_script': str(self.service_dir / 'main' / 'enhanced_jetson_main.py'),
-            'config_file': str(self.service_dir / 'main' / 'config.json'),
-            'log_file': str(self.service_dir / 'logs' / f'{self.service_name}.log'),
+            'main_script': str(MAIN_SCRIPT),
+            'config_file': str(MAIN_CONFIG_FILE),
+            'log_file': str(LOG_DIR / f'{self.service_name}.log'),
             'pid_file': f'/var/run/{self.service_name}.pid',
             'restart_policy': 'always',
             'restart_sec': 5,
@@ -96,12 +354,14 @@ class ServiceManager:
         try:
             service_content = self._generate_systemd_service_content()
             
-            # Write service file
-            with open(self.service_file, 'w') as f:
-                f.write(service_content)
+            # Skip the write (and daemon-reload) when nothing changed
+            self._service_changed = self._content_changed(self.service_file, service_content)
+            if not self._service_changed:
+                self.logger.info(f"Systemd service file unchanged: {self.service_file}")
+                return True
             
-            # Set proper permissions
-            os.chmod(self.service_file, 0o644)
+            # Write service file atomically with proper permissions
+            self._atomic_write(self.service_file, service_content, 0o644)
             
             self.logger.info(f"Systemd service file created: {self.service_file}")
             return True
@@ -110,71 +370,53 @@ class ServiceManager:
             self.logger.error(f"Failed to create systemd service: {e}")
             return False
     
+    @staticmethod
+    def _content_changed(path: Path, content: str) -> bool:
+        """Check whether file content differs from the given content"""
+        try:
+            existing = path.read_bytes()
+        except OSError:
+            return True
+        
+        existing_hash = hashlib.blake2b(existing, digest_size=16).hexdigest()
+        new_hash = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        return existing_hash != new_hash
+    
+    @staticmethod
+    def _atomic_write(path: Path, content: str, mode: int):
+        """Write file via a temporary file and rename so readers never see a partial file"""
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            tmp_path.write_text(content)
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    
     def _generate_systemd_service_content(self) -> str:
         """Generate systemd service file content"""
-        config = self.service_config
-        
-        service_content = f"""[Unit]
-Description=MyRVM Platform Integration Service
-Documentation=https://github.com/vnot01/test-cv-yolo11-sam2-camera
-After=network.target network-online.target
-Wants=network-online.target
-StartLimitInterval=60
-StartLimitBurst=3
-
-[Service]
-Type=simple
-User={config['service_user']}
-Group={config['service_group']}
-WorkingDirectory={config['working_directory']}
-ExecStart={config['python_executable']} {config['main_script']} --config {config['config_file']}
-ExecReload=/bin/kill -HUP $MAINPID
-ExecStop=/bin/kill -TERM $MAINPID
-PIDFile={config['pid_file']}
-Restart={config['restart_policy']}
-RestartSec={config['restart_sec']}
-TimeoutStartSec={config['timeout_start_sec']}
-TimeoutStopSec={config['timeout_stop_sec']}
-StandardOutput=append:{config['log_file']}
-StandardError=append:{config['log_file']}
-Environment=PYTHONPATH={config['working_directory']}
-Environment=MYRVM_ENVIRONMENT=production
-
-# Security settings
-NoNewPrivileges=true
-PrivateTmp=true
-ProtectSystem=strict
-ProtectHome=true
-ReadWritePaths={config['working_directory']} /tmp /var/run
-
-# Resource limits
-LimitNOFILE=65536
-LimitNPROC=4096
-
-[Install]
-WantedBy=multi-user.target
-"""
-        return service_content
+        return _render_systemd_unit(tuple(sorted(self.service_config.items())))
     
     def install_service(self) -> bool:
         """Install systemd service"""
+        self._invalidate_status_cache()
         try:
             # Create service file
             if not self.create_systemd_service():
                 return False
             
             # Reload systemd
-            result = subprocess.run(['sudo', 'systemctl', 'daemon-reload'], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to reload systemd: {result.stderr}")
-                return False
+            if self._service_changed:
+                ok, error = self._systemctl('daemon-reload')
+                if not ok:
+                    self.logger.error(f"Failed to reload systemd: {error}")
+                    return False
             
             # Enable service
-            result = subprocess.run(['sudo', 'systemctl', 'enable', self.service_name], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to enable service: {result.stderr}")
+            ok, error = self._systemctl('enable')
+            if not ok:
+                self.logger.error(f"Failed to enable service: {error}")
                 return False
             
             self.logger.info(f"Service {self.service_name} installed and enabled")
@@ -186,15 +428,15 @@ WantedBy=multi-user.target
     
     def uninstall_service(self) -> bool:
         """Uninstall systemd service"""
+        self._invalidate_status_cache()
         try:
             # Stop service if running
             self.stop_service()
             
             # Disable service
-            result = subprocess.run(['sudo', 'systemctl', 'disable', self.service_name], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.warning(f"Failed to disable service: {result.stderr}")
+            ok, error = self._systemctl('disable')
+            if not ok:
+                self.logger.warning(f"Failed to disable service: {error}")
             
             # Remove service file
             if self.service_file.exists():
@@ -202,10 +444,9 @@ WantedBy=multi-user.target
                 self.logger.info(f"Service file removed: {self.service_file}")
             
             # Reload systemd
-            result = subprocess.run(['sudo', 'systemctl', 'daemon-reload'], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.warning(f"Failed to reload systemd: {result.stderr}")
+            ok, error = self._systemctl('daemon-reload')
+            if not ok:
+                self.logger.warning(f"Failed to reload systemd: {error}")
             
             self.logger.info(f"Service {self.service_name} uninstalled")
             return True
@@ -216,17 +457,15 @@ WantedBy=multi-user.target
     
     def start_service(self) -> bool:
         """Start systemd service"""
+        self._invalidate_status_cache()
         try:
-            result = subprocess.run(['sudo', 'systemctl', 'start', self.service_name], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to start service: {result.stderr}")
+            ok, error = self._systemctl('start')
+            if not ok:
+                self.logger.error(f"Failed to start service: {error}")
                 return False
             
             # Wait for service to start
-            time.sleep(2)
-            
-            if self.is_service_running():
+            if self._wait_for_running(True, timeout=2):
                 self.logger.info(f"Service {self.service_name} started successfully")
                 return True
             else:
@@ -239,17 +478,15 @@ WantedBy=multi-user.target
     
     def stop_service(self) -> bool:
         """Stop systemd service"""
+        self._invalidate_status_cache()
         try:
-            result = subprocess.run(['sudo', 'systemctl', 'stop', self.service_name], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to stop service: {result.stderr}")
+            ok, error = self._systemctl('stop')
+            if not ok:
+                self.logger.error(f"Failed to stop service: {error}")
                 return False
             
             # Wait for service to stop
-            time.sleep(2)
-            
-            if not self.is_service_running():
+            if self._wait_for_running(False, timeout=2):
                 self.logger.info(f"Service {self.service_name} stopped successfully")
                 return True
             else:
@@ -262,17 +499,15 @@ WantedBy=multi-user.target
     
     def restart_service(self) -> bool:
         """Restart systemd service"""
+        self._invalidate_status_cache()
         try:
-            result = subprocess.run(['sudo', 'systemctl', 'restart', self.service_name], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to restart service: {result.stderr}")
+            ok, error = self._systemctl('restart')
+            if not ok:
+                self.logger.error(f"Failed to restart service: {error}")
                 return False
             
             # Wait for service to restart
-            time.sleep(3)
-            
-            if self.is_service_running():
+            if self._wait_for_running(True, timeout=3):
                 self.logger.info(f"Service {self.service_name} restarted successfully")
                 return True
             else:
@@ -285,11 +520,11 @@ WantedBy=multi-user.target
     
     def reload_service(self) -> bool:
         """Reload systemd service"""
+        self._invalidate_status_cache()
         try:
-            result = subprocess.run(['sudo', 'systemctl', 'reload', self.service_name], 
-                                  capture_output=True, text=True)
-            if result.returncode != 0:
-                self.logger.error(f"Failed to reload service: {result.stderr}")
+            ok, error = self._systemctl('reload')
+            if not ok:
+                self.logger.error(f"Failed to reload service: {error}")
                 return False
             
             self.logger.info(f"Service {self.service_name} reloaded successfully")
@@ -299,79 +534,158 @@ WantedBy=multi-user.target
             self.logger.error(f"Failed to reload service: {e}")
             return False
     
-    def is_service_running(self) -> bool:
-        """Check if service is running"""
+    def _wait_for_running(self, expected: bool, timeout: float) -> bool:
+        """Poll the service state with exponential backoff until it matches expected"""
+        deadline = time.monotonic() + timeout
+        delay = 0.03
+        
+        while True:
+            if self.is_service_running(max_age=0) == expected:
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+    
+    def is_service_running(self, systemd_status: Optional[Dict] = None,
+                           max_age: float = ACTIVE_CACHE_TTL) -> bool:
+        """Check if service is running, reusing a result younger than max_age seconds"""
+        if systemd_status is not None:
+            is_active = systemd_status.get('ActiveState') == 'active'
+            ServiceManager._active_cache[self.service_name] = (time.monotonic(), is_active)
+            return is_active
+        
+        cached = ServiceManager._active_cache.get(self.service_name)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        
         try:
             result = subprocess.run(['systemctl', 'is-active', self.service_name], 
                                   capture_output=True, text=True)
-            return result.stdout.strip() == 'active'
+            is_active = result.stdout.strip() == 'active'
+            ServiceManager._active_cache[self.service_name] = (time.monotonic(), is_active)
+            return is_active
         except Exception as e:
             self.logger.error(f"Failed to check service status: {e}")
             return False
     
+    def _invalidate_status_cache(self):
+        """Force the next status checks to query systemd"""
+        self._status_cache = (0, None)
+        ServiceManager._active_cache.pop(self.service_name, None)
+    
     def get_service_status(self) -> Dict:
         """Get detailed service status"""
+        cached_at, cached_status = self._status_cache
+        if cached_status is not None and time.monotonic() - cached_at < self.status_ttl:
+            return cached_status
+        
         try:
-            # Get systemd status
-            result = subprocess.run(['systemctl', 'show', self.service_name, '--no-pager'], 
-                                  capture_output=True, text=True)
-            
-            status = {}
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        status[key] = value
+            # Get systemd status (single systemctl call)
+            status = self._get_systemd_status()
             
             # Get process information
-            process_info = self._get_process_info()
+            process_info = self._get_process_info(status)
             
-            return {
+            service_status = {
                 'service_name': self.service_name,
                 'systemd_status': status,
                 'process_info': process_info,
-                'is_running': self.is_service_running(),
+                'is_running': self.is_service_running(status),
                 'service_file_exists': self.service_file.exists(),
                 'timestamp': now().isoformat()
             }
             
+            self._status_cache = (time.monotonic(), service_status)
+            return service_status
+            
         except Exception as e:
             self.logger.error(f"Failed to get service status: {e}")
             return {}
     
-    def _get_process_info(self) -> Dict:
-        """Get process information"""
+    def _get_systemd_status(self) -> Dict:
+        """Get the unit properties we report on with one systemctl call"""
+        result = subprocess.run(['systemctl', 'show', self.service_name,
+                                 '-p', ','.join(SYSTEMD_STATUS_PROPERTIES), '--no-pager'], 
+                              capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            return {}
+        
+        return dict(line.split('=', 1) for line in result.stdout.splitlines() if '=' in line)
+    
+    def _get_process_info(self, systemd_status: Optional[Dict] = None) -> Dict:
+        """Get process information (cpu_percent from the second check of the same process on)"""
         try:
-            # Find process by name
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'cpu_percent', 'memory_info']):
-                try:
-                    if proc.info['name'] == 'python3' and proc.info['cmdline']:
-                        cmdline = ' '.join(proc.info['cmdline'])
-                        if 'enhanced_jetson_main.py' in cmdline:
-                            return {
-                                'pid': proc.info['pid'],
-                                'name': proc.info['name'],
-                                'cmdline': cmdline,
-                                'cpu_percent': proc.info['cpu_percent'],
-                                'memory_info': proc.info['memory_info']._asdict() if proc.info['memory_info'] else {}
-                            }
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
+            import psutil
+        except ImportError:
+            self.logger.warning("psutil not available, process information disabled")
             return {}
+        
+        try:
+            # Use the PID systemd reported, fall back to the PID file
+            main_pid = int((systemd_status or {}).get('MainPID') or 0)
+            if not main_pid:
+                main_pid = self._read_pid_file()
+            if not main_pid:
+                return {}
+            
+            try:
+                # A new Process object's first cpu_percent is always 0.0, so it is only reported on reuse
+                fresh = self._process is None or self._process.pid != main_pid
+                if fresh:
+                    self._process = psutil.Process(main_pid)
+                proc_info = self._process.as_dict(attrs=['pid', 'name', 'cmdline', 'memory_info', 'cpu_percent'])
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self._process = None
+                return {}
+            
+            process_info = {
+                'pid': proc_info['pid'],
+                'name': proc_info['name'],
+                'cmdline': ' '.join(proc_info['cmdline'] or []),
+                'memory_info': proc_info['memory_info']._asdict() if proc_info['memory_info'] else {}
+            }
+            if not fresh:
+                process_info['cpu_percent'] = proc_info['cpu_percent']
+            
+            return process_info
             
         except Exception as e:
             self.logger.error(f"Failed to get process info: {e}")
             return {}
     
+    def _read_pid_file(self) -> int:
+        """Read service PID from the configured PID file"""
+        try:
+            with open(self.service_config['pid_file'], 'r') as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+    
     def get_service_logs(self, lines: int = 100) -> List[str]:
         """Get service logs"""
         try:
-            result = subprocess.run(['journalctl', '-u', self.service_name, '-n', str(lines), '--no-pager'], 
-                                  capture_output=True, text=True)
+            # Only read entries newer than the last poll when the window is unchanged
+            cmd = ['journalctl', '-u', self.service_name, '--no-pager', '--show-cursor']
+            if self._journal_cursor and self._journal_tail.maxlen == lines:
+                cmd += ['--after-cursor', self._journal_cursor]
+            else:
+                cmd += ['-n', str(lines)]
+                self._journal_tail = deque(maxlen=lines)
+            
+            result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
-                return result.stdout.split('\n')
+                for line in result.stdout.splitlines():
+                    if line.startswith(JOURNAL_CURSOR_PREFIX):
+                        self._journal_cursor = line[len(JOURNAL_CURSOR_PREFIX):]
+                    elif line != '-- No entries --':
+                        self._journal_tail.append(line)
+                return list(self._journal_tail)
             else:
                 self.logger.error(f"Failed to get service logs: {result.stderr}")
                 return []
@@ -383,57 +697,15 @@ WantedBy=multi-user.target
     def create_health_check_endpoint(self) -> bool:
         """Create health check endpoint"""
         try:
-            health_check_script = self.service_dir / 'scripts' / 'health_check.py'
-            health_check_script.parent.mkdir(exist_ok=True)
-            
-            health_check_content = '''#!/usr/bin/env python3
-"""
-Health Check Endpoint for MyRVM Platform Integration
-"""
-
-import sys
-import json
-from pathlib import Path
-
-# Add parent directories to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
-sys.path.append(str(Path(__file__).parent.parent / "main"))
-
-def health_check():
-    """Perform health check"""
-    try:
-        # Import main service
-        from enhanced_jetson_main import EnhancedJetsonMain
-from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
-        
-        # Check if service is running
-        # This is a simplified check - in production, you'd want more comprehensive checks
-        
-        return {
-            'status': 'healthy',
-            'timestamp': now().isoformat(),
-            'service': 'myrvm-integration'
-        }
-        
-    except Exception as e:
-        return {
-            'status': 'unhealthy',
-            'error': str(e),
-            'timestamp': now().isoformat(),
-            'service': 'myrvm-integration'
-        }
-
-if __name__ == "__main__":
-    result = health_check()
-    print(json.dumps(result))
-    sys.exit(0 if result['status'] == 'healthy' else 1)
-'''
+            health_check_script = HEALTH_CHECK_SCRIPT
             
-            with open(health_check_script, 'w') as f:
-                f.write(health_check_content)
+            if not self._content_changed(health_check_script, HEALTH_CHECK_SOURCE):
+                self.logger.info(f"Health check endpoint unchanged: {health_check_script}")
+                return True
             
-            # Make executable
-            health_check_script.chmod(0o755)
+            # Write executable script atomically
+            health_check_script.parent.mkdir(exist_ok=True)
+            self._atomic_write(health_check_script, HEALTH_CHECK_SOURCE, 0o755)
             
             self.logger.info(f"Health check endpoint created: {health_check_script}")
             return True
@@ -448,7 +720,7 @@ if __name__ == "__main__":
             status = self.get_service_status()
             logs = self.get_service_logs(10)
             
-            report = f"""
+            parts = [f"""
 Service Manager Report
 =====================
 Service Name: {status.get('service_name', 'N/A')}
@@ -462,24 +734,25 @@ Systemd Status:
 - Load State: {status.get('systemd_status', {}).get('LoadState', 'N/A')}
 
 Process Information:
-"""
+"""]
             
             process_info = status.get('process_info', {})
             if process_info:
-                report += f"- PID: {process_info.get('pid', 'N/A')}\n"
-                report += f"- CPU Percent: {process_info.get('cpu_percent', 'N/A')}%\n"
+                parts.append(f"- PID: {process_info.get('pid', 'N/A')}\n")
+                if 'cpu_percent' in process_info:
+                    parts.append(f"- CPU Percent: {process_info['cpu_percent']}%\n")
                 memory_info = process_info.get('memory_info', {})
                 if memory_info:
-                    report += f"- Memory RSS: {memory_info.get('rss', 0) / 1024 / 1024:.1f}MB\n"
+                    parts.append(f"- Memory RSS: {memory_info.get('rss', 0) / 1024 / 1024:.1f}MB\n")
             else:
-                report += "- No process information available\n"
+                parts.append("- No process information available\n")
             
-            report += f"\nRecent Logs ({len(logs)} lines):\n"
+            parts.append(f"\nRecent Logs ({len(logs)} lines):\n")
             for log_line in logs[-5:]:  # Show last 5 lines
                 if log_line.strip():
-                    report += f"- {log_line}\n"
+                    parts.append(f"- {log_line}\n")
             
-            return report
+            return ''.join(parts)
             
         except Exception as e:
             self.logger.error(f"Failed to generate service report: {e}")
@@ -7,14 +7,63 @@ Monitors system resources, performance, and logs
 import psutil
 import time
 import json
+import atexit
+import queue
+import threading
 import logging
+import logging.handlers
 from datetime import datetime
 from pathlib import Path
+from collections import deque, namedtuple
 from typing import Dict, List
 import subprocess
+import shutil
 import os
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor, wait
 from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pynvml
+    NVML_AVAILABLE = True
+except ImportError:
+    NVML_AVAILABLE = False
+
+# Seconds a get_system_info() sample is reused
+SYSTEM_INFO_TTL = 0.5
+
+# Shortest window a non-blocking CPU reading is taken over; closer calls reuse the last reading
+CPU_SAMPLE_MIN_INTERVAL = 0.5
+
+# LISTEN sockets rarely change, so they are only re-read every N samples
+NETWORK_REFRESH_TICKS = 6
+
+# Socket state code for LISTEN in /proc/net/tcp*
+TCP_LISTEN_STATE = '0A'
+
+# Fields of the nvidia-smi --query-gpu output, in column order
+GpuStat = namedtuple('GpuStat', 'name memory_total memory_used memory_free temperature utilization')
+
+def _parse_int(value: str) -> int:
+    """Parse an nvidia-smi numeric field, 0 for values like '[N/A]'"""
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+def _dumps(data) -> bytes:
+    """Serialize data as compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
 class SystemMonitor:
     """System monitoring and debugging tool"""
     
@@ -32,17 +81,67 @@ class SystemMonitor:
         self.logger = self._setup_logger()
         
         # Monitoring data
-        self.monitoring_data = []
         self.max_data_points = 1000  # Keep last 1000 data points
+        self.monitoring_data = deque(maxlen=self.max_data_points)
+        
+        # Every sample is appended to an NDJSON stream as it is collected
+        self.ndjson_file = self.log_dir / f'monitoring_{now().strftime("%Y%m%d")}.ndjson'
+        self._ndjson = open(self.ndjson_file, 'ab', buffering=1 << 16)
+        
+        # Samples are encoded and written by a background thread; full queue drops samples
+        self._write_queue = queue.Queue(maxsize=32)
+        self._dropped_samples = 0
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_loop, name='SystemMonitorWriter', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+        
+        # Previous network counters: (monotonic time, counters)
+        self._prev_net = None
+        
+        # Short-lived cache of recent samples: key -> (monotonic time, value)
+        self._cache = {}
+        
+        # Cached listening sockets
+        self._conn_cache = None
+        self._conn_cache_tick = 0
+        
+        # Collectors run in parallel so a slow one (e.g. nvidia-smi) doesn't delay the others
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='SystemMonitor')
+        
+        # NVML device handles (empty when NVML is unavailable)
+        self._gpu_handles = self._init_nvml()
+        
+        # nvidia-smi fallback path, probed once (None when not installed)
+        self._nvsmi_path = None if self._gpu_handles else shutil.which('nvidia-smi')
+        
+        # Values that never change while running
+        self._static = self._get_static_info()
+        
+        # Prime psutil's CPU counters so later cpu_percent(interval=None) calls return deltas;
+        # last reading is (monotonic time, percent), percent is None until the first reading
+        self._cpu_lock = threading.Lock()
+        psutil.cpu_percent(interval=None)
+        self._cpu_sample = (time.monotonic(), None)
     
     def _setup_logger(self) -> logging.Logger:
         """Setup logger for system monitor"""
         logger = logging.getLogger('SystemMonitor')
+        
+        # Already configured by an earlier instance; reuse its handlers
+        log_buffer = next(
+            (h for h in logger.handlers if isinstance(h, logging.handlers.MemoryHandler)), None
+        )
+        if log_buffer is not None:
+            self._log_buffer = log_buffer
+            return logger
+        
         logger.setLevel(logging.INFO)
+        logger.propagate = False
         
-        # File handler
+        # File handler (size-bounded)
         log_file = self.log_dir / f'system_monitor_{now().strftime("%Y%m%d")}.log'
-        file_handler = logging.FileHandler(log_file)
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=10 << 20, backupCount=5)
         file_handler.setLevel(logging.INFO)
         
         # Console handler
@@ -56,16 +155,48 @@ class SystemMonitor:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        logger.addHandler(file_handler)
+        # Batch file writes; errors are flushed immediately
+        self._log_buffer = logging.handlers.MemoryHandler(
+            capacity=128, flushLevel=logging.ERROR, target=file_handler
+        )
+        atexit.register(self._log_buffer.flush)
+        
+        logger.addHandler(self._log_buffer)
         logger.addHandler(console_handler)
         
         return logger
     
-    def get_system_info(self) -> Dict:
-        """Get basic system information"""
+    def _get_static_info(self) -> Dict:
+        """Get system information that is fixed for the lifetime of the process"""
+        cpu_freq = psutil.cpu_freq()
+        gpu_names = []
+        for handle in self._gpu_handles:
+            name = pynvml.nvmlDeviceGetName(handle)
+            gpu_names.append(name.decode() if isinstance(name, bytes) else name)
+        
+        return {
+            'cpu_count': psutil.cpu_count(),
+            'cpu_freq_min': cpu_freq.min if cpu_freq else None,
+            'cpu_freq_max': cpu_freq.max if cpu_freq else None,
+            'gpu_names': gpu_names
+        }
+    
+    def get_system_info(self, include_gpu: bool = True) -> Dict:
+        """Get basic system information (reused for SYSTEM_INFO_TTL seconds)"""
+        cache_key = ('system_info', include_gpu)
+        cached = self._cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SYSTEM_INFO_TTL:
+            return cached[1]
+        
+        system_info = self._collect_system_info(include_gpu)
+        if 'error' not in system_info:
+            self._cache[cache_key] = (time.monotonic(), system_info)
+        return system_info
+    
+    def _collect_system_info(self, include_gpu: bool) -> Dict:
+        """Sample basic system information"""
         try:
             # CPU information
-            cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             
             # Memory information
@@ -75,22 +206,22 @@ class SystemMonitor:
             # Disk information
             disk = psutil.disk_usage('/')
             
-            # Network information
-            network = psutil.net_io_counters()
+            # Network information (nowrap keeps counters monotonic across kernel wraparound)
+            network = psutil.net_io_counters(nowrap=True)
             
             # GPU information (if available)
-            gpu_info = self._get_gpu_info()
+            gpu_info = self._get_gpu_info() if include_gpu else {}
             
             return {
                 'timestamp': now().isoformat(),
                 'cpu': {
-                    'count': cpu_count,
+                    'count': self._static['cpu_count'],
                     'frequency': {
                         'current': cpu_freq.current if cpu_freq else None,
-                        'min': cpu_freq.min if cpu_freq else None,
-                        'max': cpu_freq.max if cpu_freq else None
+                        'min': self._static['cpu_freq_min'],
+                        'max': self._static['cpu_freq_max']
                     },
-                    'usage_percent': psutil.cpu_percent(interval=1)
+                    'usage_percent': self._cpu_percent()
                 },
                 'memory': {
                     'total': memory.total,
@@ -114,7 +245,8 @@ class SystemMonitor:
                     'bytes_sent': network.bytes_sent,
                     'bytes_recv': network.bytes_recv,
                     'packets_sent': network.packets_sent,
-                    'packets_recv': network.packets_recv
+                    'packets_recv': network.packets_recv,
+                    **self._get_network_rates(network)
                 },
                 'gpu': gpu_info
             }
@@ -123,32 +255,72 @@ class SystemMonitor:
             self.logger.error(f"Failed to get system info: {e}")
             return {'error': str(e)}
     
+    def _cpu_percent(self) -> float:
+        """CPU usage since the previous reading, shared by all callers within CPU_SAMPLE_MIN_INTERVAL"""
+        with self._cpu_lock:
+            sampled_at, usage = self._cpu_sample
+            elapsed = time.monotonic() - sampled_at
+            if elapsed >= CPU_SAMPLE_MIN_INTERVAL:
+                usage = psutil.cpu_percent(interval=None)
+            elif usage is None:
+                # First reading right after priming: wait out the rest of the window
+                usage = psutil.cpu_percent(interval=CPU_SAMPLE_MIN_INTERVAL - elapsed)
+            else:
+                return usage
+            
+            self._cpu_sample = (time.monotonic(), usage)
+            return usage
+    
+    def _get_network_rates(self, counters) -> Dict:
+        """Get per-second network rates since the previous sample"""
+        sampled_at = time.monotonic()
+        previous = self._prev_net
+        self._prev_net = (sampled_at, counters)
+        
+        if previous is None or sampled_at <= previous[0]:
+            return {'bytes_sent_rate': None, 'bytes_recv_rate': None}
+        
+        elapsed = sampled_at - previous[0]
+        return {
+            'bytes_sent_rate': (counters.bytes_sent - previous[1].bytes_sent) / elapsed,
+            'bytes_recv_rate': (counters.bytes_recv - previous[1].bytes_recv) / elapsed
+        }
+    
+    def _init_nvml(self) -> List:
+        """Initialize NVML and return device handles"""
+        if not NVML_AVAILABLE:
+            return []
+        
+        try:
+            pynvml.nvmlInit()
+            return [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+        except pynvml.NVMLError as e:
+            self.logger.info(f"NVML not available, using nvidia-smi: {e}")
+            return []
+    
     def _get_gpu_info(self) -> Dict:
-        """Get GPU information using nvidia-smi"""
+        """Get GPU information using NVML, falling back to nvidia-smi"""
+        if self._gpu_handles:
+            return self._get_gpu_info_nvml()
+        
+        if not self._nvsmi_path:
+            return {'error': 'nvidia-smi not found'}
+        
         try:
             result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=name,memory.total,memory.used,memory.free,temperature.gpu,utilization.gpu', 
+                [self._nvsmi_path, '--query-gpu=name,memory.total,memory.used,memory.free,temperature.gpu,utilization.gpu', 
                  '--format=csv,noheader,nounits'],
                 capture_output=True, text=True, timeout=10
             )
             
             if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
                 gpus = []
                 
-                for line in lines:
-                    if line.strip():
-                        parts = [p.strip() for p in line.split(',')]
-                        if len(parts) >= 6:
-                            gpu = {
-                                'name': parts[0],
-                                'memory_total': int(parts[1]) if parts[1].isdigit() else 0,
-                                'memory_used': int(parts[2]) if parts[2].isdigit() else 0,
-                                'memory_free': int(parts[3]) if parts[3].isdigit() else 0,
-                                'temperature': int(parts[4]) if parts[4].isdigit() else 0,
-                                'utilization': int(parts[5]) if parts[5].isdigit() else 0
-                            }
-                            gpus.append(gpu)
+                # nvidia-smi separates CSV fields with ', '
+                for line in result.stdout.splitlines():
+                    parts = line.split(', ')
+                    if len(parts) >= 6:
+                        gpus.append(GpuStat(parts[0], *map(_parse_int, parts[1:6]))._asdict())
                 
                 return {'gpus': gpus, 'count': len(gpus)}
             else:
@@ -161,26 +333,49 @@ class SystemMonitor:
         except Exception as e:
             return {'error': str(e)}
     
+    def _get_gpu_info_nvml(self) -> Dict:
+        """Get GPU information through NVML (memory in MiB, like nvidia-smi)"""
+        try:
+            gpus = []
+            
+            for handle, name in zip(self._gpu_handles, self._static['gpu_names']):
+                memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+                gpus.append({
+                    'name': name,
+                    'memory_total': memory.total // (1024 * 1024),
+                    'memory_used': memory.used // (1024 * 1024),
+                    'memory_free': memory.free // (1024 * 1024),
+                    'temperature': pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU),
+                    'utilization': pynvml.nvmlDeviceGetUtilizationRates(handle).gpu
+                })
+            
+            return {'gpus': gpus, 'count': len(gpus)}
+            
+        except pynvml.NVMLError as e:
+            return {'error': str(e)}
+    
     def get_process_info(self, process_name: str = None) -> List[Dict]:
         """Get information about running processes"""
         try:
             processes = []
             
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status']):
+            for proc in psutil.process_iter():
                 try:
-                    proc_info = proc.info
-                    
-                    # Filter by process name if specified
-                    if process_name and process_name.lower() not in proc_info['name'].lower():
-                        continue
-                    
-                    processes.append({
-                        'pid': proc_info['pid'],
-                        'name': proc_info['name'],
-                        'cpu_percent': proc_info['cpu_percent'],
-                        'memory_percent': proc_info['memory_percent'],
-                        'status': proc_info['status']
-                    })
+                    # Read /proc/<pid> once for all attributes
+                    with proc.oneshot():
+                        name = proc.name()
+                        
+                        # Filter by process name if specified
+                        if process_name and process_name.lower() not in name.lower():
+                            continue
+                        
+                        processes.append({
+                            'pid': proc.pid,
+                            'name': name,
+                            'cpu_percent': proc.cpu_percent(),
+                            'memory_percent': proc.memory_percent(),
+                            'status': proc.status()
+                        })
                     
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
@@ -195,11 +390,23 @@ class SystemMonitor:
             return []
     
     def get_network_connections(self) -> List[Dict]:
-        """Get network connections"""
+        """Get listening network sockets (re-read every NETWORK_REFRESH_TICKS calls)"""
+        self._conn_cache_tick += 1
+        if self._conn_cache is None or self._conn_cache_tick >= NETWORK_REFRESH_TICKS:
+            self._conn_cache = self._collect_network_connections()
+            self._conn_cache_tick = 0
+        return self._conn_cache
+    
+    def _collect_network_connections(self) -> List[Dict]:
+        """Collect listening network sockets"""
         try:
+            # Linux: read the socket tables directly, skipping psutil's per-process fd walk
+            if os.path.exists('/proc/net/tcp'):
+                return self._read_proc_listen_sockets()
+            
             connections = []
             
-            for conn in psutil.net_connections(kind='inet'):
+            for conn in psutil.net_connections(kind='tcp'):
                 if conn.status == 'LISTEN':
                     connections.append({
                         'family': str(conn.family),
@@ -216,23 +423,94 @@ class SystemMonitor:
             self.logger.error(f"Failed to get network connections: {e}")
             return []
     
-    def collect_monitoring_data(self):
-        """Collect current monitoring data"""
+    def _read_proc_listen_sockets(self) -> List[Dict]:
+        """Get LISTEN sockets from /proc/net/tcp and /proc/net/tcp6 (no PID attribution)"""
+        connections = []
+        
+        for path, family in (('/proc/net/tcp', socket.AF_INET), ('/proc/net/tcp6', socket.AF_INET6)):
+            try:
+                with open(path, 'r') as f:
+                    lines = f.readlines()[1:]
+            except FileNotFoundError:
+                continue
+            
+            for line in lines:
+                fields = line.split()
+                if fields[3] != TCP_LISTEN_STATE:
+                    continue
+                
+                address, port = fields[1].split(':')
+                connections.append({
+                    'family': str(family),
+                    'type': str(socket.SOCK_STREAM),
+                    'local_address': f"{self._decode_proc_address(address, family)}:{int(port, 16)}",
+                    'remote_address': None,
+                    'status': 'LISTEN',
+                    'pid': None
+                })
+        
+        return connections
+    
+    @staticmethod
+    def _decode_proc_address(address: str, family: int) -> str:
+        """Decode a hex address from /proc/net/tcp* (host-order 32-bit words, so packed in native byte order)"""
+        packed = b''.join(struct.pack('=I', int(address[i:i + 8], 16))
+                          for i in range(0, len(address), 8))
+        return socket.inet_ntop(family, packed)
+    
+    def collect_monitoring_data(self, timeout: float = None):
+        """
+        Collect current monitoring data
+        
+        Args:
+            timeout: Seconds to wait for collectors; late results are dropped
+        """
+        if self._closed:
+            self.logger.warning("System monitor is closed; skipping collection")
+            return None
+        
         try:
+            timestamp = now().isoformat()
+            futures = {
+                'system': self._executor.submit(self.get_system_info, include_gpu=False),
+                'gpu': self._executor.submit(self._get_gpu_info),
+                'processes': self._executor.submit(self.get_process_info),
+                'network': self._executor.submit(self.get_network_connections)
+            }
+            
+            done, not_done = wait(futures.values(), timeout=timeout)
+            for future in not_done:
+                future.cancel()
+            
+            late = [name for name, future in futures.items() if future not in done]
+            if late:
+                self.logger.warning(f"Dropped late collectors: {', '.join(late)}")
+            
+            def result(name, default):
+                return default if name in late else futures[name].result()
+            
+            system_info = {
+                **result('system', {'error': 'collection timed out'}),
+                'gpu': result('gpu', {'error': 'collection timed out'})
+            }
+            
             data = {
-                'timestamp': now().isoformat(),
-                'system': self.get_system_info(),
-                'processes': self.get_process_info(),
-                'network': self.get_network_connections()
+                'timestamp': timestamp,
+                'system': system_info,
+                'processes': result('processes', []),
+                'network': result('network', [])
             }
             
-            # Add to monitoring data
+            # Hand off to the writer thread, then add to monitoring data (oldest point drops off);
+            # once closed the writer is gone, so the sample is only kept in memory
+            if not self._closed:
+                try:
+                    self._write_queue.put_nowait(data)
+                except queue.Full:
+                    self._dropped_samples += 1
+                    self.logger.warning(f"NDJSON writer behind, dropped {self._dropped_samples} samples so far")
             self.monitoring_data.append(data)
             
-            # Keep only last N data points
-            if len(self.monitoring_data) > self.max_data_points:
-                self.monitoring_data = self.monitoring_data[-self.max_data_points:]
-            
             self.logger.info(f"Collected monitoring data: CPU {data['system'].get('cpu', {}).get('usage_percent', 0):.1f}%, "
                            f"Memory {data['system'].get('memory', {}).get('percentage', 0):.1f}%")
             
@@ -242,6 +520,29 @@ class SystemMonitor:
             self.logger.error(f"Failed to collect monitoring data: {e}")
             return None
     
+    def _writer_loop(self):
+        """Write queued samples to the NDJSON stream until close() sends None"""
+        while True:
+            data = self._write_queue.get()
+            if data is None:
+                break
+            
+            try:
+                self._ndjson.write(_dumps(data) + b'\n')
+            except Exception as e:
+                self.logger.error(f"Failed to write monitoring sample: {e}")
+        
+        self._ndjson.close()
+    
+    def close(self):
+        """Stop the collector pool, flush pending samples and stop the writer thread"""
+        self._closed = True
+        if hasattr(self, '_executor'):
+            self._executor.shutdown(wait=True)
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+    
     def save_monitoring_data(self, filename: str = None) -> str:
         """Save monitoring data to file"""
         if not filename:
@@ -251,20 +552,32 @@ class SystemMonitor:
         filepath = self.log_dir / filename
         
         try:
-            with open(filepath, 'w') as f:
-                json.dump(self.monitoring_data, f, indent=2)
+            with open(filepath, 'wb') as f:
+                f.write(_dumps(list(self.monitoring_data)))
             
             self.logger.info(f"✅ Monitoring data saved to: {filepath}")
+            if not self._ndjson.closed:
+                self._ndjson.flush()
+            self._log_buffer.flush()
             return str(filepath)
             
         except Exception as e:
             self.logger.error(f"Failed to save monitoring data: {e}")
             raise
     
-    def get_system_health(self) -> Dict:
-        """Get overall system health status"""
+    def get_system_health(self, system_info: Dict = None) -> Dict:
+        """
+        Get overall system health status
+        
+        Args:
+            system_info: Already collected get_system_info() result to evaluate
+                (defaults to the sample from the last collection)
+        """
         try:
-            system_info = self.get_system_info()
+            if system_info is None and self.monitoring_data:
+                system_info = self.monitoring_data[-1]['system']
+            elif system_info is None:
+                system_info = self.get_system_info(include_gpu=False)
             
             if 'error' in system_info:
                 return {'status': 'error', 'message': system_info['error']}
@@ -313,17 +626,20 @@ class SystemMonitor:
         """
         self.logger.info(f"Starting continuous monitoring (interval: {interval}s)")
         
-        start_time = time.time()
+        start_time = time.monotonic()
+        next_deadline = start_time
         
         try:
             while True:
-                self.collect_monitoring_data()
+                self.collect_monitoring_data(timeout=interval)
                 
                 # Check duration
-                if duration and (time.time() - start_time) >= duration:
+                if duration and (time.monotonic() - start_time) >= duration:
                     break
                 
-                time.sleep(interval)
+                # Sleep until the next fixed deadline so collection time doesn't add drift
+                next_deadline += interval
+                time.sleep(max(0.0, next_deadline - time.monotonic()))
                 
         except KeyboardInterrupt:
             self.logger.info("Monitoring stopped by user")
@@ -346,7 +662,7 @@ if __name__ == "__main__":
     
     # Get system health
     print("\n=== System Health ===")
-    health = monitor.get_system_health()
+    health = monitor.get_system_health(system_info)
     print(json.dumps(health, indent=2))
     
     # Get top processes
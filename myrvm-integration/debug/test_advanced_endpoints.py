@@ -4,18 +4,48 @@ Test Advanced API Endpoints from Jetson Orin
 Tests the newly working advanced endpoints from server-side testing
 """
 
+import os
 import sys
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Add parent directories to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "api-client"))
 
-def get_auth_token(base_url):
+from utils.test_runner import run_tests_concurrently
+from utils.timezone_manager import now
+
+# Server under test; set MYRVM_BASE_URL to an https:// URL to test over HTTP/2
+BASE_URL = os.environ.get('MYRVM_BASE_URL', "http://172.28.233.83:8001")
+
+def create_session(base_url):
+    """Create an HTTP session reused (keep-alive) by all endpoint tests
+    
+    Over HTTPS with httpx/h2 installed, the concurrent tests are multiplexed
+    as HTTP/2 streams on a single connection.
+    """
+    if HTTP2_AVAILABLE and base_url.startswith('https://'):
+        return httpx.Client(http2=True)
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=5)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_auth_token(session, base_url):
     """Get authentication token"""
     login_data = {
         'email': 'admin@myrvm.com',
@@ -23,7 +53,7 @@ def get_auth_token(base_url):
     }
     
     try:
-        response = requests.post(f"{base_url}/api/v2/auth/login", 
+        response = session.post(f"{base_url}/api/v2/auth/login", 
                                json=login_data, timeout=10)
         if response.status_code == 200:
             data = response.json()
@@ -32,7 +62,7 @@ def get_auth_token(base_url):
         print(f"❌ Login error: {e}")
     return None
 
-def test_trigger_processing(base_url, token, rvm_id=1):
+def test_trigger_processing(session, base_url, rvm_id=1):
     """Test trigger processing endpoint"""
     print("⚡ Testing trigger processing endpoint...")
     
@@ -42,11 +72,9 @@ def test_trigger_processing(base_url, token, rvm_id=1):
         'priority': 'normal'
     }
     
-    headers = {'Authorization': f'Bearer {token}'}
-    
     try:
-        response = requests.post(f"{base_url}/api/v2/trigger-processing", 
-                               json=trigger_data, headers=headers, timeout=10)
+        response = session.post(f"{base_url}/api/v2/trigger-processing", 
+                               json=trigger_data, timeout=10)
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -63,15 +91,13 @@ def test_trigger_processing(base_url, token, rvm_id=1):
         print(f"   ❌ Error: {e}")
         return False
 
-def test_rvm_status(base_url, token, rvm_id=1):
+def test_rvm_status(session, base_url, rvm_id=1):
     """Test RVM status endpoint"""
     print("\n📊 Testing RVM status endpoint...")
     
-    headers = {'Authorization': f'Bearer {token}'}
-    
     try:
-        response = requests.get(f"{base_url}/api/v2/rvm-status/{rvm_id}", 
-                              headers=headers, timeout=10)
+        response = session.get(f"{base_url}/api/v2/rvm-status/{rvm_id}", 
+                              timeout=10)
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -89,7 +115,7 @@ def test_rvm_status(base_url, token, rvm_id=1):
         print(f"   ❌ Error: {e}")
         return False
 
-def test_processing_engine_assignment(base_url, token, engine_id=28, rvm_id=1):
+def test_processing_engine_assignment(session, base_url, engine_id=28, rvm_id=1):
     """Test processing engine assignment"""
     print("\n🔗 Testing processing engine assignment...")
     
@@ -98,11 +124,9 @@ def test_processing_engine_assignment(base_url, token, engine_id=28, rvm_id=1):
         'priority': 'primary'
     }
     
-    headers = {'Authorization': f'Bearer {token}'}
-    
     try:
-        response = requests.post(f"{base_url}/api/v2/processing-engines/{engine_id}/assign", 
-                               json=assignment_data, headers=headers, timeout=10)
+        response = session.post(f"{base_url}/api/v2/processing-engines/{engine_id}/assign", 
+                               json=assignment_data, timeout=10)
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -118,16 +142,15 @@ def test_processing_engine_assignment(base_url, token, engine_id=28, rvm_id=1):
         print(f"   ❌ Error: {e}")
         return False
 
-def test_processing_history(base_url, token, rvm_id=1):
+def test_processing_history(session, base_url, rvm_id=1):
     """Test processing history endpoint"""
     print("\n📜 Testing processing history endpoint...")
     
-    headers = {'Authorization': f'Bearer {token}'}
     params = {'rvm_id': rvm_id, 'limit': 5}
     
     try:
-        response = requests.get(f"{base_url}/api/v2/detection-results/processing-history", 
-                              headers=headers, params=params, timeout=10)
+        response = session.get(f"{base_url}/api/v2/detection-results/processing-history", 
+                              params=params, timeout=10)
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -144,7 +167,7 @@ def test_processing_history(base_url, token, rvm_id=1):
         print(f"   ❌ Error: {e}")
         return False
 
-def test_upload_detection_results(base_url, token, engine_id=28):
+def test_upload_detection_results(session, base_url, engine_id=28):
     """Test upload detection results with advanced fields"""
     print("\n📸 Testing upload detection results...")
     
@@ -163,11 +186,9 @@ def test_upload_detection_results(base_url, token, engine_id=28):
         'timestamp': now().isoformat()
     }
     
-    headers = {'Authorization': f'Bearer {token}'}
-    
     try:
-        response = requests.post(f"{base_url}/api/v2/detection-results", 
-                               json=detection_data, headers=headers, timeout=10)
+        response = session.post(f"{base_url}/api/v2/detection-results", 
+                               json=detection_data, timeout=10)
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 201:
@@ -187,39 +208,31 @@ def test_upload_detection_results(base_url, token, engine_id=28):
 def main():
     """Main test function"""
     print("🚀 MyRVM Platform - Advanced Endpoints Test from Jetson Orin")
-from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
     print("=" * 70)
     
-    base_url = "http://172.28.233.83:8001"
+    base_url = BASE_URL
     print(f"Testing advanced endpoints with: {base_url}")
     
     # Get authentication token
     print("\n🔐 Getting authentication token...")
-    token = get_auth_token(base_url)
+    session = create_session(base_url)
+    token = get_auth_token(session, base_url)
     if not token:
         print("❌ Failed to get authentication token. Exiting...")
         return False
     
     print(f"✅ Authentication token obtained: {token[:50]}...")
-    
-    # Test results
-    results = {}
-    
-    # Test 1: Trigger processing
-    results['trigger_processing'] = test_trigger_processing(base_url, token)
-    
-    # Test 2: RVM status
-    results['rvm_status'] = test_rvm_status(base_url, token)
-    
-    # Test 3: Processing engine assignment
-    results['engine_assignment'] = test_processing_engine_assignment(base_url, token)
-    
-    # Test 4: Processing history
-    results['processing_history'] = test_processing_history(base_url, token)
-    
-    # Test 5: Upload detection results
-    result_id = test_upload_detection_results(base_url, token)
-    results['upload_detection'] = result_id is not None
+    session.headers['Authorization'] = f'Bearer {token}'
+    
+    # Independent tests, run concurrently
+    tests = {
+        'trigger_processing': test_trigger_processing,
+        'rvm_status': test_rvm_status,
+        'engine_assignment': test_processing_engine_assignment,
+        'processing_history': test_processing_history,
+        'upload_detection': lambda session, base_url: test_upload_detection_results(session, base_url) is not None
+    }
+    results = run_tests_concurrently(tests, session, base_url)
     
     # Summary
     print("\n" + "=" * 70)
@@ -227,7 +240,7 @@ from utils.timezone_manager import get_timezone_manager, now, format_datetime, u
     print("=" * 70)
     
     total_tests = len(results)
-    passed_tests = sum(1 for result in results.values() if result)
+    passed_tests = sum(results.values())
     
     for test_name, result in results.items():
         status = "✅ PASS" if result else "❌ FAIL"
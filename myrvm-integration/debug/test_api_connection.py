@@ -4,22 +4,77 @@ Test API Connection to MyRVM Platform
 Tests the updated API endpoints and connectivity
 """
 
+import os
 import sys
+import shelve
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import json
 import time
 from pathlib import Path
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+DEBUG_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = DEBUG_DIR.parent
 
 # Add parent directories to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
-sys.path.append(str(Path(__file__).parent.parent / "api-client"))
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "api-client"))
+
+from utils.test_runner import run_tests_concurrently
+
+# (connect, read) timeout; the connectivity probe never retries a connect,
+# so an unreachable host fails it in 3s
+REQUEST_TIMEOUT = (3, 7)
+
+# Per-user cache outside the repository; it holds a live bearer token
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'myrvm'
+
+# Login tokens are cached between runs (requires diskcache)
+TOKEN_CACHE_DIR = CACHE_DIR / 'token_cache'
+TOKEN_CACHE_TTL = 3300  # seconds
+
+# ETag/Last-Modified validators of GET responses, kept between runs
+VALIDATOR_CACHE_FILE = CACHE_DIR / 'validator_cache'
+
+# Console banners
+SEPARATOR = "=" * 60
+HEADER = f"🚀 MyRVM Platform API Connection Test\n{SEPARATOR}"
+SUMMARY_HEADER = f"\n{SEPARATOR}\n📊 TEST SUMMARY:\n{SEPARATOR}"
 
-def test_basic_connectivity(base_url):
+def create_session(connect_retries: int = 3):
+    """Create an HTTP session so all tests share one keep-alive connection pool"""
+    session = requests.Session()
+    # Connection errors are retried for every method (up to connect_retries);
+    # 5xx only for idempotent methods, so a POST is never sent twice
+    retry = Retry(total=3, connect=connect_retries, backoff_factor=0.3,
+                  status_forcelist=(500, 502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def test_basic_connectivity(session, base_url):
     """Test basic connectivity to MyRVM Platform"""
     print("🔍 Testing basic connectivity...")
     
     try:
-        response = requests.get(f"{base_url}/", timeout=10)
+        response = session.get(f"{base_url}/", timeout=REQUEST_TIMEOUT)
         print(f"   Status: {response.status_code}")
         if response.status_code == 200:
             print("   ✅ Basic connectivity successful")
@@ -31,8 +86,49 @@ def test_basic_connectivity(base_url):
         print(f"   ❌ Connection error: {e}")
         return False
 
-def test_login(base_url):
-    """Test login functionality"""
+def parse_json(response):
+    """Parse a JSON response body (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+def conditional_get(session, url, validators):
+    """GET url, revalidating against the validators of its last 200 response"""
+    headers = {}
+    cached = validators.get(url, {})
+    if 'etag' in cached:
+        headers['If-None-Match'] = cached['etag']
+    if 'last_modified' in cached:
+        headers['If-Modified-Since'] = cached['last_modified']
+    
+    response = session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 200:
+        fresh = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        validators[url] = {key: value for key, value in fresh.items() if value}
+    return response
+
+def get_cached_token(session, base_url, token_cache, cache_key):
+    """Get a cached token if the server still accepts it"""
+    token = token_cache.get(cache_key)
+    if not token:
+        return None
+    
+    try:
+        response = session.get(f"{base_url}/api/v2/deposits",
+                              headers={'Authorization': f'Bearer {token}'}, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 200:
+            return token
+    except Exception:
+        return None
+    
+    token_cache.delete(cache_key)
+    return None
+
+def test_login(session, base_url, token_cache=None):
+    """Test login functionality, reusing a still-valid cached token"""
     print("\n🔐 Testing login...")
     
     login_data = {
@@ -40,17 +136,27 @@ def test_login(base_url):
         'password': 'password'
     }
     
+    cache_key = f"{base_url}|{login_data['email']}"
+    if token_cache is not None:
+        token = get_cached_token(session, base_url, token_cache, cache_key)
+        if token:
+            print(f"   ✅ Using cached token")
+            print(f"   Token: {token[:50]}...")
+            return token
+    
     try:
-        response = requests.post(f"{base_url}/api/v2/auth/login", 
-                               json=login_data, timeout=10)
+        response = session.post(f"{base_url}/api/v2/auth/login", 
+                               json=login_data, timeout=REQUEST_TIMEOUT)
         print(f"   Status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             if 'data' in data and 'token' in data['data']:
                 token = data['data']['token']
                 print(f"   ✅ Login successful")
                 print(f"   Token: {token[:50]}...")
+                if token_cache is not None:
+                    token_cache.set(cache_key, token, expire=TOKEN_CACHE_TTL)
                 return token
             else:
                 print(f"   ❌ Login failed: No token in response")
@@ -64,127 +170,79 @@ def test_login(base_url):
         print(f"   ❌ Login error: {e}")
         return None
 
-def test_deposits_endpoint(base_url, token=None):
-    """Test deposits endpoint"""
-    print("\n💰 Testing deposits endpoint...")
-    
-    headers = {}
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-    
-    try:
-        response = requests.get(f"{base_url}/api/v2/deposits", 
-                              headers=headers, timeout=10)
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            deposits = data.get('data', [])
-            print(f"   ✅ Deposits endpoint successful")
-            print(f"   Found {len(deposits)} deposits")
-            return True
-        else:
-            print(f"   ❌ Deposits endpoint failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
-    except Exception as e:
-        print(f"   ❌ Deposits error: {e}")
-        return False
+@dataclass
+class EndpointTest:
+    """Endpoint test case: request to send and how to report the response"""
+    name: str
+    title: str
+    label: str
+    path: str
+    method: str = 'GET'
+    body: Optional[Dict] = None
+    expected_status: int = 200
+    describe: Callable[[Dict], str] = lambda data: f"Found {len(data.get('data', []))} records"
 
-def test_processing_engines_endpoint(base_url, token=None):
-    """Test processing engines endpoint"""
-    print("\n🤖 Testing processing engines endpoint...")
-    
-    headers = {}
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-    
-    try:
-        response = requests.get(f"{base_url}/api/v2/processing-engines", 
-                              headers=headers, timeout=10)
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            engines = data.get('data', [])
-            print(f"   ✅ Processing engines endpoint successful")
-            print(f"   Found {len(engines)} processing engines")
-            return True
-        else:
-            print(f"   ❌ Processing engines endpoint failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
-    except Exception as e:
-        print(f"   ❌ Processing engines error: {e}")
-        return False
+# Tests that only depend on the auth token
+ENDPOINT_TESTS = [
+    EndpointTest('deposits', '💰 Testing deposits endpoint...', 'Deposits endpoint',
+                 '/api/v2/deposits',
+                 describe=lambda data: f"Found {len(data.get('data', []))} deposits"),
+    EndpointTest('processing_engines', '🤖 Testing processing engines endpoint...', 'Processing engines endpoint',
+                 '/api/v2/processing-engines',
+                 describe=lambda data: f"Found {len(data.get('data', []))} processing engines"),
+    EndpointTest('detection_results', '📸 Testing detection results endpoint...', 'Detection results endpoint',
+                 '/api/v2/detection-results',
+                 describe=lambda data: f"Found {len(data.get('data', []))} detection results"),
+    EndpointTest('create_deposit', '💾 Testing create deposit...', 'Create deposit',
+                 '/api/v2/deposits', method='POST', expected_status=201,
+                 body={
+                     'rvm_id': 1,
+                     'user_id': 1,
+                     'waste_type': 'plastic',
+                     'quantity': 1,
+                     'weight': 0.5,
+                     'location': 'Jetson Orin Nano Test',
+                     'notes': 'Test deposit from updated API client'
+                 },
+                 describe=lambda data: f"Deposit ID: {data.get('data', {}).get('id', 'N/A')}")
+]
 
-def test_detection_results_endpoint(base_url, token=None):
-    """Test detection results endpoint"""
-    print("\n📸 Testing detection results endpoint...")
-    
-    headers = {}
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
+def run_endpoint_test(session, base_url, endpoint, validators):
+    """Run one endpoint test case"""
+    print(f"\n{endpoint.title}")
     
     try:
-        response = requests.get(f"{base_url}/api/v2/detection-results", 
-                              headers=headers, timeout=10)
-        print(f"   Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            results = data.get('data', [])
-            print(f"   ✅ Detection results endpoint successful")
-            print(f"   Found {len(results)} detection results")
-            return True
+        url = f"{base_url}{endpoint.path}"
+        if endpoint.method == 'GET':
+            response = conditional_get(session, url, validators)
         else:
-            print(f"   ❌ Detection results endpoint failed: {response.status_code}")
-            print(f"   Response: {response.text}")
-            return False
-    except Exception as e:
-        print(f"   ❌ Detection results error: {e}")
-        return False
-
-def test_create_deposit(base_url, token=None):
-    """Test create deposit functionality"""
-    print("\n💾 Testing create deposit...")
-    
-    headers = {}
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-    
-    deposit_data = {
-        'rvm_id': 1,
-        'user_id': 1,
-        'waste_type': 'plastic',
-        'quantity': 1,
-        'weight': 0.5,
-        'location': 'Jetson Orin Nano Test',
-        'notes': 'Test deposit from updated API client'
-    }
-    
-    try:
-        response = requests.post(f"{base_url}/api/v2/deposits", 
-                               json=deposit_data, headers=headers, timeout=10)
+            response = session.request(endpoint.method, url, json=endpoint.body, timeout=REQUEST_TIMEOUT)
         print(f"   Status: {response.status_code}")
         
-        if response.status_code == 201:
-            data = response.json()
-            print(f"   ✅ Create deposit successful")
-            print(f"   Deposit ID: {data.get('data', {}).get('id', 'N/A')}")
+        if response.status_code == 304:
+            print(f"   ✅ {endpoint.label} successful (not modified since last run)")
+            return True
+        elif response.status_code == endpoint.expected_status:
+            data = parse_json(response)
+            print(f"   ✅ {endpoint.label} successful")
+            print(f"   {endpoint.describe(data)}")
             return True
         else:
-            print(f"   ❌ Create deposit failed: {response.status_code}")
+            print(f"   ❌ {endpoint.label} failed: {response.status_code}")
             print(f"   Response: {response.text}")
             return False
     except Exception as e:
-        print(f"   ❌ Create deposit error: {e}")
+        print(f"   ❌ {endpoint.label} error: {e}")
         return False
 
+def ensure_cache_dir():
+    """Create the per-user cache directory, readable by its owner only"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    os.chmod(CACHE_DIR, 0o700)
+
 def main():
     """Main test function"""
-    print("🚀 MyRVM Platform API Connection Test")
-    print("=" * 60)
+    print(HEADER)
     
     base_url = "http://172.28.233.83:8001"
     print(f"Testing connection to: {base_url}")
@@ -192,32 +250,50 @@ def main():
     # Test results
     results = {}
     
-    # Test 1: Basic connectivity
-    results['connectivity'] = test_basic_connectivity(base_url)
+    ensure_cache_dir()
+    token_cache = diskcache.Cache(str(TOKEN_CACHE_DIR)) if DISKCACHE_AVAILABLE else None
+    if token_cache is not None and '--fresh-login' in sys.argv:
+        token_cache.clear()
     
-    # Test 2: Login
-    token = test_login(base_url)
-    results['login'] = token is not None
+    validator_store = shelve.open(str(VALIDATOR_CACHE_FILE))
+    validators = dict(validator_store)
     
-    # Test 3: Deposits endpoint
-    results['deposits'] = test_deposits_endpoint(base_url, token)
+    # Test 1: Basic connectivity, without connect retries so a dead host fails fast
+    with create_session(connect_retries=0) as probe_session:
+        results['connectivity'] = test_basic_connectivity(probe_session, base_url)
     
-    # Test 4: Processing engines endpoint
-    results['processing_engines'] = test_processing_engines_endpoint(base_url, token)
+    with create_session() as session:
+        # Test 2: Login (skipped when the server is unreachable)
+        token = None
+        if results['connectivity']:
+            token = test_login(session, base_url, token_cache)
+        else:
+            print("\n⏭️  Server unreachable, skipping remaining tests")
+        results['login'] = token is not None
+        
+        # Tests 3-6 only depend on the token, run them concurrently
+        if token:
+            session.headers['Authorization'] = f'Bearer {token}'
+            results.update(run_tests_concurrently({
+                endpoint.name: functools.partial(run_endpoint_test, endpoint=endpoint, validators=validators)
+                for endpoint in ENDPOINT_TESTS
+            }, session, base_url))
+        else:
+            if results['connectivity']:
+                print("\n⏭️  No auth token, skipping endpoint tests")
+            results.update({endpoint.name: False for endpoint in ENDPOINT_TESTS})
     
-    # Test 5: Detection results endpoint
-    results['detection_results'] = test_detection_results_endpoint(base_url, token)
+    validator_store.update(validators)
+    validator_store.close()
     
-    # Test 6: Create deposit
-    results['create_deposit'] = test_create_deposit(base_url, token)
+    if token_cache is not None:
+        token_cache.close()
     
     # Summary
-    print("\n" + "=" * 60)
-    print("📊 TEST SUMMARY:")
-    print("=" * 60)
+    print(SUMMARY_HEADER)
     
     total_tests = len(results)
-    passed_tests = sum(1 for result in results.values() if result)
+    passed_tests = sum(results.values())
     
     for test_name, result in results.items():
         status = "✅ PASS" if result else "❌ FAIL"
@@ -6,6 +6,7 @@ Test Stage 4 backup and recovery for MyRVM Platform Integration
 
 import os
 import json
+import functools
 import time
 import logging
 import sys
@@ -14,32 +15,80 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List
 
+DEBUG_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = DEBUG_DIR.parent
+
 # Add parent directories to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
-sys.path.append(str(Path(__file__).parent.parent / "backup"))
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "backup"))
 
 from backup_manager import BackupManager
 from recovery_manager import RecoveryManager
 from backup_monitor import BackupMonitor
 from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
+from utils.test_runner import run_tests_concurrently, run_test_buffered
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Console banners
+SEPARATOR = "=" * 60
+HEADER = f"🚀 Stage 4: Backup & Recovery Test\n{SEPARATOR}"
+SUMMARY_HEADER = f"\n📊 Test Results Summary\n{SEPARATOR}"
+
+# Shared test configuration (covers backup, recovery and monitoring)
+TEST_CONFIG = {
+    'backup_enabled': True,
+    'backup_interval': 10,  # 10 seconds for testing
+    'retention_days': 7,
+    'compression_enabled': True,
+    'encryption_enabled': True,
+    'backup_dir': 'test_backups/shared',  # siblings of the per-test dirs
+    'recovery_enabled': True,
+    'recovery_timeout': 300,
+    'auto_recovery': False,
+    'backup_monitoring_enabled': True,
+    'backup_monitoring_interval': 10,  # 10 seconds for testing
+    'backup_monitoring_rules': {
+        'backup_failure': {
+            'enabled': True,
+            'severity': 'critical',
+            'threshold': 1
+        },
+        'storage_usage_high': {
+            'enabled': True,
+            'severity': 'warning',
+            'threshold': 80
+        }
+    }
+}
+
+_managers_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=None)
+def _build_managers(config_key: str):
+    """Build backup, recovery and monitoring components for a configuration"""
+    config = json.loads(config_key)
+    backup_manager = BackupManager(config)
+    recovery_manager = RecoveryManager(config, backup_manager)
+    backup_monitor = BackupMonitor(config, backup_manager)
+    return backup_manager, recovery_manager, backup_monitor
+
+def get_managers(config: Dict):
+    """Get components for a configuration, built once and shared between tests"""
+    with _managers_lock:
+        return _build_managers(json.dumps(config, sort_keys=True))
 
 def test_backup_manager():
     """Test backup manager functionality"""
     print("\n💾 Testing Backup Manager...")
     
     try:
-        # Create test configuration
-        config = {
-            'backup_enabled': True,
-            'backup_interval': 10,  # 10 seconds for testing
-            'retention_days': 7,
-            'compression_enabled': True,
-            'encryption_enabled': True,
-            'backup_dir': 'test_backups'
-        }
-        
-        # Initialize backup manager
-        backup_manager = BackupManager(config)
+        # Own backup_dir so concurrent tests don't collide
+        backup_manager, _, _ = get_managers({**TEST_CONFIG, 'backup_dir': 'test_backups/manager'})
         
         # Test backup strategies initialization
         if backup_manager.backup_strategies:
@@ -62,19 +111,20 @@ def test_backup_manager():
                 print("   ✅ Backup file exists and is accessible")
             else:
                 print(f"   ⚠️ Backup file not found at expected location: {backup_file}")
-                # Check if there are any backup files in the directory
-                backup_dir = backup_manager.database_backup_dir
-                if backup_dir.exists():
-                    backup_files = list(backup_dir.glob('*'))
-                    if backup_files:
-                        print(f"   ✅ Found {len(backup_files)} backup files in directory")
-                        print(f"   ✅ Latest backup: {backup_files[-1].name}")
-                    else:
-                        print("   ❌ No backup files found in directory")
-                        return False
-                else:
+                # Check if there are any backup files in the directory (one directory read)
+                try:
+                    with os.scandir(backup_manager.database_backup_dir) as entries:
+                        backup_files = [(entry.stat().st_mtime, entry.name) for entry in entries if entry.is_file()]
+                except FileNotFoundError:
                     print("   ❌ Backup directory does not exist")
                     return False
+                
+                if backup_files:
+                    print(f"   ✅ Found {len(backup_files)} backup files in directory")
+                    print(f"   ✅ Latest backup: {max(backup_files)[1]}")
+                else:
+                    print("   ❌ No backup files found in directory")
+                    return False
         else:
             print(f"   ❌ Database backup failed: {db_result.get('error', 'Unknown error')}")
             return False
@@ -139,15 +189,8 @@ def test_recovery_manager():
     print("\n🔄 Testing Recovery Manager...")
     
     try:
-        # Create test configuration
-        config = {
-            'recovery_enabled': True,
-            'recovery_timeout': 300,
-            'auto_recovery': False
-        }
-        
-        # Initialize recovery manager
-        recovery_manager = RecoveryManager(config)
+        # Standalone, without a backup manager
+        recovery_manager = RecoveryManager(TEST_CONFIG)
         
         # Test recovery procedures initialization
         if recovery_manager.recovery_procedures:
@@ -227,26 +270,8 @@ def test_backup_monitor():
     print("\n📊 Testing Backup Monitor...")
     
     try:
-        # Create test configuration
-        config = {
-            'backup_monitoring_enabled': True,
-            'backup_monitoring_interval': 10,  # 10 seconds for testing
-            'backup_monitoring_rules': {
-                'backup_failure': {
-                    'enabled': True,
-                    'severity': 'critical',
-                    'threshold': 1
-                },
-                'storage_usage_high': {
-                    'enabled': True,
-                    'severity': 'warning',
-                    'threshold': 80
-                }
-            }
-        }
-        
-        # Initialize backup monitor
-        backup_monitor = BackupMonitor(config)
+        # Standalone, without a backup manager
+        backup_monitor = BackupMonitor(TEST_CONFIG)
         
         # Test monitoring rules initialization
         if backup_monitor.monitoring_rules:
@@ -258,8 +283,10 @@ def test_backup_monitor():
         # Test monitoring data collection
         print("   Testing monitoring data collection...")
         
+        # Collectors run concurrently in one batch
+        backup_monitor.collect_all()
+        
         # Test backup status collection
-        backup_monitor._collect_backup_status()
         backup_status = backup_monitor.monitoring_data.get('backup_status', {})
         if backup_status:
             print("   ✅ Backup status collection working")
@@ -268,7 +295,6 @@ def test_backup_monitor():
             return False
         
         # Test storage usage collection
-        backup_monitor._collect_storage_usage()
         storage_usage = backup_monitor.monitoring_data.get('storage_usage', {})
         if storage_usage:
             print("   ✅ Storage usage collection working")
@@ -277,7 +303,6 @@ def test_backup_monitor():
             return False
         
         # Test performance metrics collection
-        backup_monitor._collect_performance_metrics()
         performance_metrics = backup_monitor.monitoring_data.get('performance_metrics', {})
         if performance_metrics:
             print("   ✅ Performance metrics collection working")
@@ -321,24 +346,8 @@ def test_backup_recovery_integration():
     print("\n🔗 Testing Backup & Recovery Integration...")
     
     try:
-        # Create comprehensive configuration
-        config = {
-            'backup_enabled': True,
-            'backup_interval': 10,
-            'retention_days': 7,
-            'compression_enabled': True,
-            'encryption_enabled': True,
-            'backup_dir': 'test_backups',
-            'recovery_enabled': True,
-            'recovery_timeout': 300,
-            'backup_monitoring_enabled': True,
-            'backup_monitoring_interval': 10
-        }
-        
-        # Initialize all components
-        backup_manager = BackupManager(config)
-        recovery_manager = RecoveryManager(config, backup_manager)
-        backup_monitor = BackupMonitor(config, backup_manager)
+        # Own backup_dir so concurrent tests don't collide
+        backup_manager, recovery_manager, backup_monitor = get_managers({**TEST_CONFIG, 'backup_dir': 'test_backups/integration'})
         
         print("   ✅ All components initialized successfully")
         
@@ -362,7 +371,7 @@ def test_backup_recovery_integration():
         
         # Test monitoring integration
         print("   Testing monitoring integration...")
-        backup_monitor._collect_backup_status()
+        backup_monitor.collect_all()
         monitoring_data = backup_monitor.get_monitoring_data()
         if monitoring_data:
             print("   ✅ Monitoring integration working")
@@ -394,36 +403,21 @@ def test_backup_performance():
     print("\n⚡ Testing Backup Performance...")
     
     try:
-        # Create test configuration
-        config = {
-            'backup_enabled': True,
-            'backup_interval': 1,  # 1 second for testing
-            'retention_days': 1,
-            'compression_enabled': True,
-            'encryption_enabled': True,
-            'backup_dir': 'test_backups'
-        }
-        
-        # Initialize backup manager
-        backup_manager = BackupManager(config)
+        backup_manager, _, _ = get_managers({**TEST_CONFIG, 'backup_dir': 'test_backups/performance'})
         
         # Test backup performance
         print("   Testing backup performance...")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Run multiple backups
-        backup_results = []
-        for i in range(3):
-            result = backup_manager.run_manual_backup('config')
-            backup_results.append(result)
-            time.sleep(0.5)  # Small delay between backups
+        # Run multiple backups in one batch
+        backup_results = backup_manager.run_manual_backups(['config'] * 3)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         
         # Check results
-        successful_backups = sum(1 for result in backup_results if result.get('success', False))
+        successful_backups = sum(result.get('success', False) for result in backup_results)
         total_backups = len(backup_results)
         
         if successful_backups == total_backups:
@@ -437,9 +431,9 @@ def test_backup_performance():
             return False
         
         # Test backup history performance
-        history_start = time.time()
+        history_start = time.perf_counter()
         history = backup_manager.get_backup_history(100)
-        history_time = time.time() - history_start
+        history_time = time.perf_counter() - history_start
         
         if history:
             print(f"   ✅ Backup history performance: {history_time:.3f}s for {len(history)} entries")
@@ -459,21 +453,7 @@ def test_backup_recovery_scenarios():
     print("\n🎭 Testing Backup & Recovery Scenarios...")
     
     try:
-        # Create test configuration
-        config = {
-            'backup_enabled': True,
-            'backup_interval': 10,
-            'retention_days': 7,
-            'compression_enabled': True,
-            'encryption_enabled': True,
-            'backup_dir': 'test_backups',
-            'recovery_enabled': True,
-            'recovery_timeout': 300
-        }
-        
-        # Initialize components
-        backup_manager = BackupManager(config)
-        recovery_manager = RecoveryManager(config, backup_manager)
+        backup_manager, recovery_manager, _ = get_managers({**TEST_CONFIG, 'backup_dir': 'test_backups/scenarios'})
         
         # Scenario 1: Full backup cycle
         print("   Testing full backup cycle...")
@@ -496,12 +476,8 @@ def test_backup_recovery_scenarios():
         # Scenario 3: Multiple backup types
         print("   Testing multiple backup types...")
         backup_types = ['database', 'config', 'logs', 'application']
-        successful_types = 0
-        
-        for backup_type in backup_types:
-            result = backup_manager.run_manual_backup(backup_type)
-            if result.get('success', False):
-                successful_types += 1
+        successful_types = sum(result.get('success', False)
+                               for result in backup_manager.run_manual_backups(backup_types))
         
         if successful_types == len(backup_types):
             print(f"   ✅ Multiple backup types working: {successful_types}/{len(backup_types)}")
@@ -529,31 +505,23 @@ def test_backup_recovery_scenarios():
 
 def main():
     """Main test function"""
-    print("🚀 Stage 4: Backup & Recovery Test")
-    print("=" * 60)
-    
-    test_results = {
-        'backup_manager': False,
-        'recovery_manager': False,
-        'backup_monitor': False,
-        'backup_recovery_integration': False,
-        'backup_performance': False,
-        'backup_recovery_scenarios': False
-    }
+    print(HEADER)
     
-    # Run individual component tests
-    test_results['backup_manager'] = test_backup_manager()
-    test_results['recovery_manager'] = test_recovery_manager()
-    test_results['backup_monitor'] = test_backup_monitor()
+    # Tests are independent (each backing-up test uses its own backup_dir), run them concurrently
+    test_results = run_tests_concurrently({
+        'backup_manager': test_backup_manager,
+        'recovery_manager': test_recovery_manager,
+        'backup_monitor': test_backup_monitor,
+        'backup_recovery_integration': test_backup_recovery_integration,
+        'backup_performance': test_backup_performance
+    })
     
-    # Run integration tests
-    test_results['backup_recovery_integration'] = test_backup_recovery_integration()
-    test_results['backup_performance'] = test_backup_performance()
-    test_results['backup_recovery_scenarios'] = test_backup_recovery_scenarios()
+    # The scenarios test backs up the application tree, which contains the other
+    # tests' backup dirs, so it runs alone once they have finished writing
+    test_results['backup_recovery_scenarios'] = run_test_buffered(test_backup_recovery_scenarios)
     
     # Summary
-    print("\n📊 Test Results Summary")
-    print("=" * 60)
+    print(SUMMARY_HEADER)
     
     passed_tests = sum(test_results.values())
     total_tests = len(test_results)
@@ -571,18 +539,26 @@ def main():
         print("⚠️  Some tests failed. Please check the logs for details.")
     
     # Save test results
-    results_file = Path(__file__).parent.parent / 'logs' / f'backup_recovery_test_{now().strftime("%Y%m%d_%H%M%S")}.json'
+    results_file = PROJECT_ROOT / 'logs' / f'backup_recovery_test_{now().strftime("%Y%m%d_%H%M%S")}.json'
     results_file.parent.mkdir(exist_ok=True)
     
-    with open(results_file, 'w') as f:
-        json.dump({
-            'test_results': test_results,
-            'timestamp': now().isoformat(),
-            'passed_tests': passed_tests,
-            'total_tests': total_tests
-        }, f, indent=2)
+    summary = {
+        'test_results': test_results,
+        'timestamp': now().isoformat(),
+        'passed_tests': passed_tests,
+        'total_tests': total_tests
+    }
+    
+    # Machine-read file: compact JSON written in one call
+    if ORJSON_AVAILABLE:
+        results_file.write_bytes(orjson.dumps(summary))
+    else:
+        results_file.write_text(json.dumps(summary, separators=(',', ':')))
     
     print(f"📝 Test results saved to: {results_file}")
+    
+    return passed_tests == total_tests
 
 if __name__ == "__main__":
-    main()
+    success = main()
+    sys.exit(0 if success else 1)
@@ -9,36 +9,96 @@ import json
 import time
 import logging
 import sys
+import shutil
+import tempfile
+import importlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List
 
+DEBUG_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = DEBUG_DIR.parent
+LOGS_DIR = PROJECT_ROOT / 'logs'
+
 # Add parent directories to path for imports
-sys.path.append(str(Path(__file__).parent.parent))
-sys.path.append(str(Path(__file__).parent.parent / "backup"))
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(PROJECT_ROOT / "backup"))
+
+# Per-module import locks make it safe to load the backup modules on threads,
+# overlapping their heavy dependency imports (cryptography, psutil, schedule)
+with ThreadPoolExecutor(max_workers=3) as executor:
+    backup_manager_module, recovery_manager_module, backup_monitor_module = executor.map(
+        importlib.import_module, ['backup_manager', 'recovery_manager', 'backup_monitor']
+    )
+BackupManager = backup_manager_module.BackupManager
+RecoveryManager = recovery_manager_module.RecoveryManager
+BackupMonitor = backup_monitor_module.BackupMonitor
 
-from backup_manager import BackupManager
-from recovery_manager import RecoveryManager
-from backup_monitor import BackupMonitor
 from utils.timezone_manager import get_timezone_manager, now, format_datetime, utc_now
+from utils.test_runner import run_test_buffered
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Configuration shared by the integration test and main(); each run adds an
+# absolute temporary backup_dir, outside the application tree that gets archived
+INTEGRATION_CONFIG = {
+    'backup_enabled': True,
+    'backup_interval': 10,
+    'retention_days': 7,
+    'compression_enabled': True,
+    'compression_tool': 'pigz',
+    'compression_level': 3,
+    'skip_compressed_extensions': True,
+    'encryption_enabled': True,
+    'recovery_enabled': True,
+    'recovery_timeout': 300,
+    'backup_monitoring_enabled': True,
+    'backup_monitoring_interval': 10
+}
 
-def test_backup_manager_working():
+# Summary labels, in report order
+TEST_LABELS = (
+    ('backup_manager', 'Backup Manager'),
+    ('recovery_manager', 'Recovery Manager'),
+    ('backup_monitor', 'Backup Monitor'),
+    ('backup_recovery_integration', 'Backup Recovery Integration'),
+)
+
+def record_result(fd, test_name, result):
+    """Append one test result to the progress log as a JSON line"""
+    entry = {'test': test_name, 'result': result, 't': time.time()}
+    blob = orjson.dumps(entry) if ORJSON_AVAILABLE else json.dumps(entry).encode()
+    os.write(fd, blob + b'\n')
+
+def test_backup_manager_working(backup_manager=None):
     """Test backup manager functionality - working version"""
     print("\n💾 Testing Backup Manager (Working)...")
     
+    owned_backup_dir = None
     try:
-        # Create test configuration
-        config = {
-            'backup_enabled': True,
-            'backup_interval': 10,
-            'retention_days': 7,
-            'compression_enabled': True,
-            'encryption_enabled': True,
-            'backup_dir': 'test_backups_working'
-        }
+        if backup_manager is None:
+            owned_backup_dir = tempfile.mkdtemp(prefix='bkp_')
+            
+            # Create test configuration
+            config = {
+                'backup_enabled': True,
+                'backup_interval': 10,
+                'retention_days': 7,
+                'compression_enabled': True,
+                'compression_tool': 'pigz',
+                'compression_level': 3,
+                'skip_compressed_extensions': True,
+                'encryption_enabled': True,
+                'backup_dir': owned_backup_dir
+            }
         
-        # Initialize backup manager
-        backup_manager = BackupManager(config)
+            # Initialize backup manager
+            backup_manager = BackupManager(config)
         
         # Test backup strategies initialization
         if backup_manager.backup_strategies:
@@ -47,80 +107,21 @@ def test_backup_manager_working():
             print("   ❌ Backup strategies initialization failed")
             return False
         
-        # Test manual backup execution
+        # Test manual backup execution (all four strategies in one concurrent batch)
         print("   Testing manual backup execution...")
-        
-        # Test database backup
-        db_result = backup_manager.run_manual_backup('database')
-        backup_success = False
-        
-        if db_result.get('success', False):
-            print("   ✅ Database backup working")
-            backup_file = db_result.get('backup_file', 'N/A')
-            print(f"   ✅ Backup file: {backup_file}")
-            
-            # Check if backup file exists
-            if os.path.exists(backup_file):
-                print("   ✅ Backup file exists and is accessible")
-                backup_success = True
+        strategy_names = ['database', 'config', 'logs', 'application']
+        backup_results = dict(zip(strategy_names, backup_manager.run_manual_backups(strategy_names, concurrent=True)))
+        
+        # BackupManager fsyncs, stats and checksums each file itself, so the
+        # returned results are all the test needs to check
+        for strategy_name, label in (('database', 'Database'), ('config', 'Config'),
+                                     ('logs', 'Logs'), ('application', 'Application')):
+            result = backup_results[strategy_name]
+            if result.get('success', False) and result.get('verified', False):
+                print(f"   ✅ {label} backup working: {result['backup_file']}")
             else:
-                print(f"   ⚠️ Backup file not found at expected location: {backup_file}")
-                # Check if there are any backup files in the directory
-                backup_dir = backup_manager.database_backup_dir
-                if backup_dir.exists():
-                    backup_files = list(backup_dir.glob('*'))
-                    if backup_files:
-                        print(f"   ✅ Found {len(backup_files)} backup files in directory")
-                        print(f"   ✅ Latest backup: {backup_files[-1].name}")
-                        # This is actually success - backup was created with different name due to compression/encryption
-                        print("   ✅ Backup file created successfully (with compression/encryption)")
-                        backup_success = True
-                    else:
-                        print("   ❌ No backup files found in directory")
-                else:
-                    print("   ❌ Backup directory does not exist")
-        else:
-            print(f"   ❌ Database backup failed: {db_result.get('error', 'Unknown error')}")
-            # Check if backup was actually created despite the error
-            backup_dir = backup_manager.database_backup_dir
-            if backup_dir.exists():
-                backup_files = list(backup_dir.glob('*'))
-                if backup_files:
-                    print(f"   ✅ Found {len(backup_files)} backup files in directory")
-                    print(f"   ✅ Latest backup: {backup_files[-1].name}")
-                    print("   ✅ Backup file created successfully (with compression/encryption)")
-                    backup_success = True
-                else:
-                    print("   ❌ No backup files found in directory")
-            else:
-                print("   ❌ Backup directory does not exist")
-        
-        if not backup_success:
-            return False
-        
-        # Test config backup
-        config_result = backup_manager.run_manual_backup('config')
-        if config_result.get('success', False):
-            print("   ✅ Config backup working")
-        else:
-            print(f"   ❌ Config backup failed: {config_result.get('error', 'Unknown error')}")
-            return False
-        
-        # Test logs backup
-        logs_result = backup_manager.run_manual_backup('logs')
-        if logs_result.get('success', False):
-            print("   ✅ Logs backup working")
-        else:
-            print(f"   ❌ Logs backup failed: {logs_result.get('error', 'Unknown error')}")
-            return False
-        
-        # Test application backup
-        app_result = backup_manager.run_manual_backup('application')
-        if app_result.get('success', False):
-            print("   ✅ Application backup working")
-        else:
-            print(f"   ❌ Application backup failed: {app_result.get('error', 'Unknown error')}")
-            return False
+                print(f"   ❌ {label} backup failed: {result.get('error', 'backup file not verified')}")
+                return False
         
         # Test backup status
         status = backup_manager.get_backup_status()
@@ -152,6 +153,9 @@ def test_backup_manager_working():
     except Exception as e:
         print(f"   ❌ Backup Manager test failed: {e}")
         return False
+    finally:
+        if owned_backup_dir:
+            shutil.rmtree(owned_backup_dir, ignore_errors=True)
 
 def test_recovery_manager_working():
     """Test recovery manager functionality - working version"""
@@ -239,11 +243,11 @@ def test_backup_monitor_working():
             print("   ❌ Monitoring rules initialization failed")
             return False
         
-        # Test monitoring data collection
+        # Test monitoring data collection (the three collectors run concurrently)
         print("   Testing monitoring data collection...")
+        backup_monitor.collect_all()
         
         # Test backup status collection
-        backup_monitor._collect_backup_status()
         backup_status = backup_monitor.monitoring_data.get('backup_status', {})
         if backup_status:
             print("   ✅ Backup status collection working")
@@ -252,7 +256,6 @@ def test_backup_monitor_working():
             return False
         
         # Test storage usage collection
-        backup_monitor._collect_storage_usage()
         storage_usage = backup_monitor.monitoring_data.get('storage_usage', {})
         if storage_usage:
             print("   ✅ Storage usage collection working")
@@ -261,7 +264,6 @@ def test_backup_monitor_working():
             return False
         
         # Test performance metrics collection
-        backup_monitor._collect_performance_metrics()
         performance_metrics = backup_monitor.monitoring_data.get('performance_metrics', {})
         if performance_metrics:
             print("   ✅ Performance metrics collection working")
@@ -300,29 +302,20 @@ def test_backup_monitor_working():
         print(f"   ❌ Backup Monitor test failed: {e}")
         return False
 
-def test_backup_recovery_integration_working():
+def test_backup_recovery_integration_working(backup_manager=None, recovery_manager=None, backup_monitor=None):
     """Test integration of backup and recovery components - working version"""
     print("\n🔗 Testing Backup & Recovery Integration (Working)...")
     
+    owned_backup_dir = None
     try:
-        # Create comprehensive configuration
-        config = {
-            'backup_enabled': True,
-            'backup_interval': 10,
-            'retention_days': 7,
-            'compression_enabled': True,
-            'encryption_enabled': True,
-            'backup_dir': 'test_backups_integration_working',
-            'recovery_enabled': True,
-            'recovery_timeout': 300,
-            'backup_monitoring_enabled': True,
-            'backup_monitoring_interval': 10
-        }
-        
-        # Initialize all components
-        backup_manager = BackupManager(config)
-        recovery_manager = RecoveryManager(config, backup_manager)
-        backup_monitor = BackupMonitor(config, backup_manager)
+        if backup_manager is None:
+            owned_backup_dir = tempfile.mkdtemp(prefix='bkp_')
+            config = {**INTEGRATION_CONFIG, 'backup_dir': owned_backup_dir}
+            
+            # Initialize all components
+            backup_manager = BackupManager(config)
+            recovery_manager = RecoveryManager(config, backup_manager)
+            backup_monitor = BackupMonitor(config, backup_manager)
         
         print("   ✅ All components initialized successfully")
         
@@ -363,6 +356,9 @@ def test_backup_recovery_integration_working():
     except Exception as e:
         print(f"   ❌ Backup & Recovery Integration test failed: {e}")
         return False
+    finally:
+        if owned_backup_dir:
+            shutil.rmtree(owned_backup_dir, ignore_errors=True)
 
 def main():
     """Main test function"""
@@ -376,24 +372,46 @@ def main():
         'backup_recovery_integration': False
     }
     
-    # Run individual component tests
-    test_results['backup_manager'] = test_backup_manager_working()
-    test_results['recovery_manager'] = test_recovery_manager_working()
-    test_results['backup_monitor'] = test_backup_monitor_working()
-    
-    # Run integration tests
-    test_results['backup_recovery_integration'] = test_backup_recovery_integration_working()
+    # Each result is appended as it lands, so a crash still leaves partial results
+    LOGS_DIR.mkdir(exist_ok=True)
+    progress_file = LOGS_DIR / f'backup_recovery_working_test_{now():%Y%m%d_%H%M%S}.jsonl'
+    progress_fd = os.open(progress_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    backup_dir = tempfile.mkdtemp(prefix='bkp_')
+    try:
+        # Backup components are built once and shared by the backup manager and integration tests
+        config = {**INTEGRATION_CONFIG, 'backup_dir': backup_dir}
+        backup_manager = BackupManager(config)
+        recovery_manager = RecoveryManager(config, backup_manager)
+        backup_monitor = BackupMonitor(config, backup_manager)
+        
+        # Run individual component tests (each test's output is written in one go)
+        test_results['backup_manager'] = run_test_buffered(test_backup_manager_working, backup_manager)
+        record_result(progress_fd, 'backup_manager', test_results['backup_manager'])
+        test_results['recovery_manager'] = run_test_buffered(test_recovery_manager_working)
+        record_result(progress_fd, 'recovery_manager', test_results['recovery_manager'])
+        test_results['backup_monitor'] = run_test_buffered(test_backup_monitor_working)
+        record_result(progress_fd, 'backup_monitor', test_results['backup_monitor'])
+        
+        # Run integration tests
+        test_results['backup_recovery_integration'] = run_test_buffered(
+            test_backup_recovery_integration_working, backup_manager, recovery_manager, backup_monitor
+        )
+        record_result(progress_fd, 'backup_recovery_integration', test_results['backup_recovery_integration'])
+    finally:
+        os.close(progress_fd)
+        shutil.rmtree(backup_dir, ignore_errors=True)
     
     # Summary
     print("\n📊 Test Results Summary")
     print("=" * 60)
     
-    passed_tests = sum(test_results.values())
-    total_tests = len(test_results)
-    
-    for test_name, result in test_results.items():
+    passed_tests = 0
+    for test_name, label in TEST_LABELS:
+        result = test_results[test_name]
+        passed_tests += result
         status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{test_name.replace('_', ' ').title()}: {status}")
+        print(f"{label}: {status}")
+    total_tests = len(test_results)
     
     print(f"\nOverall Result: {passed_tests}/{total_tests} tests passed")
     
@@ -403,17 +421,27 @@ def main():
     else:
         print("⚠️  Some tests failed. Please check the logs for details.")
     
-    # Save test results
-    results_file = Path(__file__).parent.parent / 'logs' / f'backup_recovery_working_test_{now().strftime("%Y%m%d_%H%M%S")}.json'
-    results_file.parent.mkdir(exist_ok=True)
+    # Save test results; one timestamp keeps the filename and payload in step
+    finished_at = now()
+    results_file = LOGS_DIR / f'backup_recovery_working_test_{finished_at:%Y%m%d_%H%M%S}.json'
+    
+    summary = {
+        'test_results': test_results,
+        'timestamp': finished_at.isoformat(),
+        'passed_tests': passed_tests,
+        'total_tests': total_tests
+    }
+    if ORJSON_AVAILABLE:
+        blob = orjson.dumps(summary, option=orjson.OPT_INDENT_2)
+    else:
+        blob = json.dumps(summary, indent=2).encode()
     
-    with open(results_file, 'w') as f:
-        json.dump({
-            'test_results': test_results,
-            'timestamp': now().isoformat(),
-            'passed_tests': passed_tests,
-            'total_tests': total_tests
-        }, f, indent=2)
+    # Single unbuffered write
+    fd = os.open(results_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, blob)
+    finally:
+        os.close(fd)
     
     print(f"📝 Test results saved to: {results_file}")
 
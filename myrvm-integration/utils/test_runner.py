@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Runner Helpers for MyRVM Platform Integration
+Run independent debug tests concurrently with readable output
+"""
+
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class ThreadBufferedStdout:
+    """Stdout proxy that buffers output per worker thread so concurrent tests don't interleave"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def capture(self, test_func, *args):
+        """Run test_func, returning its result and everything it printed"""
+        self._local.buffer = io.StringIO()
+        try:
+            return test_func(*args), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+def run_tests_concurrently(tests, *args):
+    """Run independent tests in parallel and print their output in order"""
+    stdout = ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = {name: executor.submit(stdout.capture, test_func, *args)
+                       for name, test_func in tests.items()}
+            outcomes = {name: future.result() for name, future in futures.items()}
+    finally:
+        sys.stdout = stdout._stream
+    
+    # Replay all buffered output with a single write
+    sys.stdout.write(''.join(output for _, output in outcomes.values()))
+    sys.stdout.flush()
+    return {name: result for name, (result, _) in outcomes.items()}
+
+def run_test_buffered(test_func, *args):
+    """Run a single test, writing everything it printed in one go"""
+    stdout = ThreadBufferedStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        result, output = stdout.capture(test_func, *args)
+    finally:
+        sys.stdout = stdout._stream
+    
+    sys.stdout.write(output)
+    sys.stdout.flush()
+    return result